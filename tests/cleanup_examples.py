@@ -13,13 +13,9 @@ This file demonstrates different ways to configure the cleanup system.
 """
 
 import sys
-import os
 from pathlib import Path
 
-# Add the tests directory to the path so we can import test_utils
-sys.path.insert(0, os.path.dirname(__file__))
-
-from test_utils import cleanup_test_files, CLEANUP_CONFIG, CLEANUP_PATTERNS
+from unit.test_utils import cleanup_test_files, CLEANUP_CONFIG, CLEANUP_PATTERNS
 
 def example_minimal_cleanup():
     """Example: Only clean up files with test prefix"""
@@ -71,13 +67,12 @@ def example_full_cleanup():
 
 def show_configuration():
     """Show current configuration and available patterns"""
-    print("Current cleanup configuration:")
-    for key, value in CLEANUP_CONFIG.items():
-        print(f"  {key}: {value}")
-    
-    print("\nAvailable cleanup patterns:")
-    for key, pattern in CLEANUP_PATTERNS.items():
-        print(f"  {key}: {pattern}")
+    lines = ["Current cleanup configuration:"]
+    lines.extend(f"  {key}: {value}" for key, value in CLEANUP_CONFIG.items())
+    lines.append("")
+    lines.append("Available cleanup patterns:")
+    lines.extend(f"  {key}: {pattern}" for key, pattern in CLEANUP_PATTERNS.items())
+    sys.stdout.write("\n".join(lines) + "\n")
 
 if __name__ == "__main__":
     show_configuration()
@@ -9,12 +9,17 @@ Cleanup script for file server shared_files directory
 """
 
 import os
-import glob
+import functools
 from pathlib import Path
 
+@functools.lru_cache(maxsize=1)
+def _shared_dir() -> Path:
+    """Resolve the file server shared_files directory once per process"""
+    return Path(__file__).parent.parent / "file-server" / "shared_files"
+
 def cleanup_shared_files():
     """Clean up all files in the file server shared_files directory"""
-    shared_files_path = Path(__file__).parent.parent / "file-server" / "shared_files"
+    shared_files_path = _shared_dir()
     
     if not shared_files_path.exists():
         print(f"Directory {shared_files_path} does not exist")
@@ -23,14 +28,15 @@ def cleanup_shared_files():
     files_deleted = 0
     
     # Delete all files except metadata.json
-    for file_path in shared_files_path.glob("*"):
-        if file_path.is_file() and file_path.name != "metadata.json":
-            try:
-                file_path.unlink()
-                files_deleted += 1
-                print(f"Deleted: {file_path.name}")
-            except Exception as e:
-                print(f"Error deleting {file_path.name}: {e}")
+    with os.scandir(shared_files_path) as entries:
+        for entry in entries:
+            if entry.name != "metadata.json" and entry.is_file():
+                try:
+                    os.unlink(entry.path)
+                    files_deleted += 1
+                    print(f"Deleted: {entry.name}")
+                except Exception as e:
+                    print(f"Error deleting {entry.name}: {e}")
     
     # Reset metadata.json to empty object
     metadata_file = shared_files_path / "metadata.json"
@@ -14,13 +14,9 @@ output and uploads directories.
 """
 
 import sys
-import os
 from pathlib import Path
 
-# Add the tests directory to the path so we can import test_utils
-sys.path.insert(0, os.path.dirname(__file__))
-
-from test_utils import cleanup_test_files, list_test_files, TEST_FILE_PREFIX, CLEANUP_CONFIG
+from unit.test_utils import cleanup_test_files, list_test_files, TEST_FILE_PREFIX, CLEANUP_CONFIG
 
 def main():
     """Main cleanup function"""
@@ -31,8 +27,7 @@ def main():
     test_files = list_test_files()
     if test_files:
         print(f"Found {len(test_files)} test files:")
-        for file_path in test_files:
-            print(f"  - {file_path}")
+        sys.stdout.write("".join(f"  - {file_path}\n" for file_path in test_files))
     else:
         print("No test files found.")
         return
@@ -46,8 +41,7 @@ def main():
     remaining_files = list_test_files()
     if remaining_files:
         print(f"Warning: {len(remaining_files)} test files remain:")
-        for file_path in remaining_files:
-            print(f"  - {file_path}")
+        sys.stdout.write("".join(f"  - {file_path}\n" for file_path in remaining_files))
     else:
         print("All test files successfully removed.")
 
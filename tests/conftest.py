@@ -4,40 +4,61 @@
 # requires-python = ">=3.12,<3.13"
 # dependencies = [
 #     "pytest==8.4.*",
-#     "pytest-asyncio==1.0.*",
+#     "pytest-asyncio>=1.4",
+#     "uvloop>=0.21; sys_platform != 'win32'",
 # ]
 # ///
 """
 Main test configuration and fixtures for all tests
 """
 
+import asyncio
 import pytest
-import sys
 import os
 
-# Add the tests directory to the path so we can import test_utils
-sys.path.insert(0, os.path.dirname(__file__))
+try:
+    import uvloop
+except ImportError:  # not available on Windows
+    uvloop = None
 
 from unit.test_utils import (
     get_test_filename, 
     cleanup_test_files, 
     ensure_test_directories,
+    is_xdist_worker,
     TEST_FILE_PREFIX,
     CLEANUP_CONFIG
 )
 
-@pytest.fixture(autouse=True, scope="session")
-def cleanup_session_artifacts():
-    """Clean up test artifacts once per session (before and after all tests)"""
-    # Clean up before all tests
+def pytest_asyncio_loop_factories(config, item):
+    """Run async tests on uvloop when it is installed; the suite is dominated by socket I/O"""
+    if uvloop is None:
+        return {"asyncio": asyncio.new_event_loop}
+    return {"uvloop": uvloop.new_event_loop}
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    """Send every test marked ``serial`` to the same xdist worker under ``--dist loadgroup``
+    
+    Runs before xdist's own hook, which reads the group marks to assign workers.
+    """
+    for item in items:
+        if item.get_closest_marker("serial"):
+            item.add_marker(pytest.mark.xdist_group("serial"))
+
+def pytest_sessionstart(session):
+    """Clean up test artifacts once before all tests (controller process only under xdist)"""
+    if hasattr(session.config, "workerinput"):
+        return
     cleanup_test_files()
     ensure_test_directories()
+
+def pytest_sessionfinish(session, exitstatus):
+    """Clean up test artifacts once after all tests (controller process only under xdist)"""
+    if hasattr(session.config, "workerinput"):
+        return
     
-    yield
-    
-    # Clean up after all tests - comprehensive cleanup
     import subprocess
-    import os
     
     try:
         # Run the cleanup utility for file-server artifacts
@@ -50,9 +71,20 @@ def cleanup_session_artifacts():
     # Standard test file cleanup
     cleanup_test_files()
 
-@pytest.fixture(autouse=True)
-def cleanup_test_files_fixture():
-    """Automatically clean up test files before and after each test"""
+@pytest.fixture
+def file_cleanup():
+    """Clean up test files before and after each test that opts in
+    
+    Modules that upload or compile files request this via
+    ``pytest.mark.usefixtures("file_cleanup")``; everything else relies on the
+    session-level cleanup in ``pytest_sessionstart``/``pytest_sessionfinish``.
+    """
+    # Parallel workers share the same directories, so per-test cleanup would
+    # delete files another worker is still using; the controller cleans up instead
+    if is_xdist_worker():
+        yield
+        return
+    
     # Ensure test directories exist
     ensure_test_directories()
     
@@ -67,6 +99,4 @@ def cleanup_test_files_fixture():
 @pytest.fixture
 def test_filename():
     """Fixture to generate test filenames with proper prefix, descriptor, and identifier"""
-    def _get_test_filename(base_name: str, extension: str = "", descriptor: str = "") -> str:
-        return get_test_filename(base_name, extension, descriptor)
-    return _get_test_filename 
\ No newline at end of file
+    return get_test_filename
\ No newline at end of file
@@ -4,40 +4,61 @@
 # requires-python = ">=3.12,<3.13"
 # dependencies = [
 #     "pytest==8.4.*",
-#     "pytest-asyncio==1.0.*",
+#     "pytest-asyncio>=1.4",
+#     "uvloop>=0.21; sys_platform != 'win32'",
 #     "httpx==0.28.*",
 #     "fastmcp>=2.10",
+#     "orjson>=3.10",
 # ]
 # ///
 """
 Integration test fixtures and utilities
 """
 
+import hashlib
+import itertools
+import os
+import re
+from dataclasses import dataclass
+
 import pytest
+import pytest_asyncio
 import httpx
-import tempfile
+import orjson
 from pathlib import Path
-from typing import Dict, Any, AsyncGenerator
-import json
+from typing import Dict, Any, AsyncGenerator, Callable, Optional, List, Tuple
 import asyncio
-import sys
-import os
 
-# Add the tests directory to the path so we can import test_utils
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+if __name__ == "__main__":
+    # pytest puts tests/ on sys.path via its pythonpath setting; a direct run needs it added here
+    import sys
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
 
 from unit.test_utils import (
     get_test_filename, 
-    cleanup_test_files, 
-    ensure_test_directories,
     TEST_FILE_PREFIX
 )
+from mcp_session_helper import find_sse_data_line
 
 # Test configuration
 GATEWAY_URL = "http://localhost:8080"
+HELLO_WORLD_URL = "http://localhost:8001"
 LATEX_SERVER_URL = "http://localhost:8002"
 
-@pytest.fixture
+# Headers shared by every MCP POST; session requests add Mcp-Session-Id on top
+MCP_HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json, text/event-stream"
+}
+
+# Compile errors that mention (pdf)latex mean the toolchain is missing in this environment
+LATEX_UNAVAILABLE = re.compile(r"latex", re.IGNORECASE)
+
+# Services are local, so fail fast on connect; keep pooled connections alive across tests
+HTTP_TIMEOUT = httpx.Timeout(30.0, connect=1.0)
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=100, max_connections=1000, keepalive_expiry=300.0)
+
+@pytest.fixture(scope="session")
 def sample_latex_document() -> str:
     """Sample LaTeX document for testing"""
     return r"""
@@ -69,7 +90,7 @@ Here's a formula: $E = mc^2$
 \end{document}
 """
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def invalid_latex_document() -> str:
     """Invalid LaTeX document for error testing"""
     return r"""
@@ -81,10 +102,10 @@ def invalid_latex_document() -> str:
 \end{document}
 """
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def large_latex_document() -> str:
     """Large LaTeX document for size testing"""
-    content = r"""
+    header = r"""
 \documentclass{article}
 \begin{document}
 \title{Large Document}
@@ -92,69 +113,99 @@ def large_latex_document() -> str:
 \maketitle
 
 """
+    lorem = "Lorem ipsum dolor sit amet. " * 10
     # Add many paragraphs
-    for i in range(1000):
-        content += f"This is paragraph {i}. " + "Lorem ipsum dolor sit amet. " * 10 + "\n\n"
+    paragraphs = "".join(f"This is paragraph {i}. {lorem}\n\n" for i in range(1000))
     
-    content += r"\end{document}"
-    return content
+    return header + paragraphs + r"\end{document}"
 
 @pytest.fixture
 async def mcp_session() -> AsyncGenerator[httpx.AsyncClient, None]:
     """HTTP client with MCP session initialization"""
-    timeout = httpx.Timeout(20.0, connect=10.0)  # More generous timeouts for stability
-    limits = httpx.Limits(max_keepalive_connections=20, max_connections=30)  # Better connection pooling
-    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+    async with httpx.AsyncClient(timeout=HTTP_TIMEOUT, limits=HTTP_LIMITS) as client:
         yield client
 
 @pytest.fixture
-def temp_tex_file(sample_latex_document: str) -> Path:
-    """Create temporary .tex file"""
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.tex', delete=False) as f:
-        f.write(sample_latex_document)
-        return Path(f.name)
-
-@pytest.fixture(autouse=True)
-def cleanup_test_files_fixture():
-    """Automatically clean up test files before and after each test"""
-    # Ensure test directories exist
-    ensure_test_directories()
-    
-    # Clean up before test
-    cleanup_test_files()
+def temp_tex_file(sample_latex_document: str, tmp_path: Path) -> Callable[[], Path]:
+    """Factory returning a .tex file path, written under tmp_path only on first call"""
+    tex_path = tmp_path / "sample.tex"
     
-    yield
+    def _materialize() -> Path:
+        if not tex_path.exists():
+            tex_path.write_text(sample_latex_document)
+        return tex_path
     
-    # Clean up after test
-    cleanup_test_files()
+    return _materialize
 
 @pytest.fixture
 def test_filename():
     """Fixture to generate test filenames with proper prefix, descriptor, and identifier"""
-    def _get_test_filename(base_name: str, extension: str = "", descriptor: str = "") -> str:
-        return get_test_filename(base_name, extension, descriptor)
-    return _get_test_filename
+    return get_test_filename
+
+@dataclass(slots=True, frozen=True)
+class UploadResult:
+    """Parsed result of latex_upload_latex_file"""
+    success: bool
+    file_id: Optional[str] = None
+    filename: Optional[str] = None
+    original_filename: Optional[str] = None
+    user_friendly_name: Optional[str] = None
+    size_bytes: Optional[int] = None
+    error: Optional[str] = None
+    
+    @classmethod
+    def from_response(cls, data: Dict[str, Any]) -> "UploadResult":
+        """Build from a tool result dict, ignoring keys this class does not model"""
+        return cls(**{name: data.get(name) for name in cls.__dataclass_fields__ if name in data})
+
+@dataclass(slots=True, frozen=True)
+class CompileResult:
+    """Parsed result of latex_compile_latex_by_id"""
+    success: bool
+    file_id: Optional[str] = None
+    filename: Optional[str] = None
+    original_filename: Optional[str] = None
+    output_filename: Optional[str] = None
+    download_url: Optional[str] = None
+    size_bytes: Optional[int] = None
+    error: Optional[str] = None
+    
+    @classmethod
+    def from_response(cls, data: Dict[str, Any]) -> "CompileResult":
+        """Build from a tool result dict, ignoring keys this class does not model"""
+        return cls(**{name: data.get(name) for name in cls.__dataclass_fields__ if name in data})
 
 class MCPToolHelper:
     """Helper class for MCP tool calls with proper session management"""
     
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, client: Optional[httpx.AsyncClient] = None):
         self.base_url = base_url
+        self.mcp_url = f"{base_url}/mcp/"
         self.session_id = None
-        self.client = None
+        self.session_headers: Dict[str, str] = MCP_HEADERS
+        self.client = client
+        self._initialized_notification: Optional[asyncio.Task] = None
+        # Injected clients are shared and closed by their owner, not by this helper
+        self._owns_client = client is None
+        # Counter for default request IDs, so calls on a shared session never reuse one
+        self._next_id = itertools.count(1)
+        # Opt-in cache of successful compile results, keyed by uploaded source content
+        self._compile_cache_enabled = os.environ.get("MCP_TEST_COMPILE_CACHE") == "1"
+        self._compile_cache: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        self._source_by_id: Dict[str, Tuple[str, str]] = {}
     
     async def __aenter__(self):
         """Async context manager entry"""
-        # Optimized timeout and connection settings for concurrent operations
-        timeout = httpx.Timeout(20.0, connect=10.0)  # More generous timeouts for concurrent operations
-        limits = httpx.Limits(max_keepalive_connections=20, max_connections=30)  # Increased connection pool
-        self.client = httpx.AsyncClient(timeout=timeout, limits=limits)
+        if self._owns_client:
+            self.client = httpx.AsyncClient(timeout=HTTP_TIMEOUT, limits=HTTP_LIMITS)
         await self.initialize()
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self.client:
+        if self._initialized_notification is not None:
+            await asyncio.gather(self._initialized_notification, return_exceptions=True)
+        if self.client and self._owns_client:
             await self.client.aclose()
     
     async def initialize(self) -> Dict[str, Any]:
@@ -178,12 +229,9 @@ class MCPToolHelper:
         }
         
         response = await self.client.post(
-            f"{self.base_url}/mcp/",
-            json=init_request,
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream"
-            }
+            self.mcp_url,
+            content=orjson.dumps(init_request),
+            headers=MCP_HEADERS
         )
         
         if response.status_code != 200:
@@ -193,43 +241,60 @@ class MCPToolHelper:
         self.session_id = response.headers.get("mcp-session-id")
         if not self.session_id:
             raise RuntimeError(f"No session ID returned from initialize. Headers: {dict(response.headers)}")
+        self.session_headers = {**MCP_HEADERS, "Mcp-Session-Id": self.session_id}
         
         # Parse SSE response
-        init_result = self._parse_sse_response(response.text)
+        init_result = self._parse_response(response)
         
-        # Step 2: Send initialized notification
+        # Step 2: Send initialized notification in the background; the first
+        # request on this session waits for it, so ordering is preserved
         initialized_request = {
             "jsonrpc": "2.0",
             "method": "notifications/initialized",
             "params": {}
         }
         
-        notify_response = await self.client.post(
-            f"{self.base_url}/mcp/",
-            json=initialized_request,
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream",
-                "Mcp-Session-Id": self.session_id
-            }
-        )
+        self._initialized_notification = asyncio.create_task(self.client.post(
+            self.mcp_url,
+            content=orjson.dumps(initialized_request),
+            headers=self.session_headers
+        ))
+        
+        return init_result
+    
+    async def ensure_initialized(self):
+        """Wait for the initialized notification sent by initialize() to be accepted"""
+        notification = self._initialized_notification
+        if notification is None:
+            return
+        
+        notify_response = await notification
+        self._initialized_notification = None
         
         if notify_response.status_code not in [200, 202]:
             raise RuntimeError(f"Initialized notification failed: {notify_response.status_code}")
-        
-        return init_result
     
-    async def call_tool(self, tool_name: str, arguments: Dict[str, Any] = None) -> Dict[str, Any]:
+    async def call_tool(self, tool_name: str, arguments: Dict[str, Any] = None, request_id: str = None) -> Dict[str, Any]:
         """Call MCP tool and return parsed result"""
         if not self.client or not self.session_id:
             raise RuntimeError("Session not initialized")
         
         if arguments is None:
             arguments = {}
+        
+        if request_id is None:
+            request_id = f"test_{tool_name}_{next(self._next_id)}"
+        
+        cache_key = self._compile_cache_key(tool_name, arguments)
+        if cache_key in self._compile_cache:
+            # Copy so a caller mutating its result cannot corrupt the cache
+            return dict(self._compile_cache[cache_key])
+        
+        await self.ensure_initialized()
             
         request = {
             "jsonrpc": "2.0",
-            "id": f"test_{tool_name}",
+            "id": request_id,
             "method": "tools/call",
             "params": {
                 "name": tool_name,
@@ -238,36 +303,142 @@ class MCPToolHelper:
         }
         
         response = await self.client.post(
-            f"{self.base_url}/mcp/",
-            json=request,
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream",
-                "Mcp-Session-Id": self.session_id
+            self.mcp_url,
+            content=orjson.dumps(request),
+            headers=self.session_headers
+        )
+        
+        if response.status_code != 200:
+            return {"success": False, "error": f"HTTP {response.status_code}: {response.text}"}
+        
+        result = self._parse_response(response)
+        if self._compile_cache_enabled and result.get("success"):
+            if tool_name.endswith("upload_latex_file") and "file_id" in result:
+                source_hash = hashlib.sha256(arguments.get("content", "").encode()).hexdigest()
+                self._source_by_id[result["file_id"]] = (source_hash, arguments.get("filename", ""))
+            elif cache_key is not None:
+                self._compile_cache[cache_key] = result
+        return result
+    
+    def _compile_cache_key(self, tool_name: str, arguments: Dict[str, Any]) -> Optional[Tuple[str, str, str]]:
+        """Cache key for a compile call, or None if it must go to the server
+        
+        Enabled with MCP_TEST_COMPILE_CACHE=1. Compiles of uploads with identical source,
+        upload filename and output filename return the same PDF metadata, so pdflatex only
+        needs to run once per combination. Only successful compiles are cached.
+        
+        Compiles without an output filename are never cached: the server then names the
+        PDF after the file_id, so another upload of the same source gets a different PDF.
+        """
+        if not self._compile_cache_enabled or not tool_name.endswith("compile_latex_by_id"):
+            return None
+        output_filename = arguments.get("output_filename")
+        if not output_filename:
+            return None
+        source = self._source_by_id.get(arguments.get("file_id"))
+        if source is None:
+            return None
+        return (*source, output_filename)
+    
+    async def call_tool_stream(self, tool_name: str, content_json: bytes, arguments: Dict[str, Any] = None, request_id: str = None) -> Dict[str, Any]:
+        """Call MCP tool with a pre-encoded JSON string as its "content" argument
+        
+        Only the small request envelope is serialized here; content_json is streamed
+        as its own body chunk, so large payloads are never re-encoded or copied into
+        a combined buffer.
+        """
+        if not self.client or not self.session_id:
+            raise RuntimeError("Session not initialized")
+        
+        if request_id is None:
+            request_id = f"test_{tool_name}_{next(self._next_id)}"
+        
+        await self.ensure_initialized()
+        
+        request = {
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "method": "tools/call",
+            "params": {
+                "name": tool_name,
+                "arguments": {**(arguments or {}), "content": None}
             }
+        }
+        head, placeholder, tail = orjson.dumps(request).rpartition(b'"content":null')
+        head += b'"content":'
+        
+        async def body():
+            yield head
+            yield content_json
+            yield tail
+        
+        response = await self.client.post(
+            self.mcp_url,
+            content=body(),
+            headers={**self.session_headers, "Content-Length": str(len(head) + len(content_json) + len(tail))}
         )
         
         if response.status_code == 200:
-            return self._parse_sse_response(response.text)
+            return self._parse_response(response)
         else:
             return {"success": False, "error": f"HTTP {response.status_code}: {response.text}"}
     
-    def _parse_sse_response(self, response_text: str) -> Dict[str, Any]:
-        """Parse MCP response from SSE format"""
-        lines = response_text.strip().split('\n')
+    async def upload_file(self, content: str, filename: str) -> UploadResult:
+        """Upload LaTeX source through latex_upload_latex_file and parse the result"""
+        result = await self.call_tool("latex_upload_latex_file", {"content": content, "filename": filename})
+        return UploadResult.from_response({"success": False, **result})
+    
+    async def compile_file(self, file_id: str, output_filename: Optional[str] = None) -> CompileResult:
+        """Compile an uploaded file through latex_compile_latex_by_id and parse the result"""
+        arguments = {"file_id": file_id}
+        if output_filename is not None:
+            arguments["output_filename"] = output_filename
+        result = await self.call_tool("latex_compile_latex_by_id", arguments)
+        return CompileResult.from_response({"success": False, **result})
+    
+    async def upload_latex(self, content: str, filename: str, tool_name: str = "latex_upload_latex_file") -> Dict[str, Any]:
+        """Upload LaTeX source
         
-        # Find the data line
-        data_line = None
-        for line in lines:
-            if line.startswith('data: '):
-                data_line = line[6:]  # Remove 'data: ' prefix
-                break
+        Tool arguments must be JSON, so the source is encoded to a JSON string once
+        and streamed through call_tool_stream instead of being re-serialized as part
+        of the request envelope.
+        """
+        return await self.call_tool_stream(tool_name, orjson.dumps(content), {"filename": filename})
+    
+    async def call_tools_batch(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Call several MCP tools at once and return their parsed results in call order
+        
+        The MCP streamable HTTP transport rejects JSON-RPC batch arrays, so the calls
+        are sent as overlapping requests on this session, each with a unique request id.
+        """
+        return list(await asyncio.gather(*(
+            self.call_tool(tool_name, arguments, request_id=f"batch_{index}_{tool_name}")
+            for index, (tool_name, arguments) in enumerate(calls)
+        )))
+    
+    def _parse_response(self, response: httpx.Response) -> Dict[str, Any]:
+        """Parse MCP response, skipping SSE framing when the server replied with plain JSON"""
+        # The MCP transport requires clients to accept both formats, but a server
+        # running in JSON-response mode answers with a bare JSON-RPC body
+        if response.headers.get("content-type", "").startswith("application/json"):
+            return self._parse_mcp_data(response.content)
+        return self._parse_sse_response(response.content)
+    
+    def _parse_sse_response(self, response_bytes: bytes) -> Dict[str, Any]:
+        """Parse MCP response from SSE format"""
+        # Work on the raw UTF-8 body: orjson decodes bytes directly, so the
+        # response never goes through httpx's charset detection and str decode
+        data_line = find_sse_data_line(response_bytes)
         
         if not data_line:
-            return {"success": False, "error": f"No data line found in SSE response: {response_text}"}
+            return {"success": False, "error": f"No data line found in SSE response: {response_bytes.decode('utf-8', 'replace')}"}
         
+        return self._parse_mcp_data(data_line)
+    
+    def _parse_mcp_data(self, data_line: bytes) -> Dict[str, Any]:
+        """Unwrap a JSON-RPC response payload into the tool's result dict"""
         try:
-            data = json.loads(data_line)
+            data = orjson.loads(data_line)
             if "result" in data:
                 result = data["result"]
                 if isinstance(result, dict) and "content" in result:
@@ -276,8 +447,8 @@ class MCPToolHelper:
                         text = content[0].get("text", "{}")
                         # Try to parse as JSON, but if it fails, treat as plain text
                         try:
-                            return json.loads(text)
-                        except json.JSONDecodeError:
+                            return orjson.loads(text)
+                        except orjson.JSONDecodeError:
                             # If parsing fails, it's a plain text response (possibly an error)
                             if result.get("isError"):
                                 return {"success": False, "error": text}
@@ -288,26 +459,65 @@ class MCPToolHelper:
                 return {"success": False, "error": data["error"]}
             else:
                 return data
-        except json.JSONDecodeError as e:
-            return {"success": False, "error": f"Invalid JSON in SSE data: {data_line}"}
+        except orjson.JSONDecodeError as e:
+            return {"success": False, "error": f"Invalid JSON in MCP response: {data_line.decode('utf-8', 'replace')}"}
         
         return {"success": False, "error": "Failed to parse response"}
 
-@pytest.fixture
-async def gateway_helper():
-    """Helper for gateway tool calls with proper MCP session"""
-    async with MCPToolHelper(GATEWAY_URL) as helper:
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def shared_http_client() -> AsyncGenerator[httpx.AsyncClient, None]:
+    """Session-wide HTTP client so tests reuse pooled keepalive connections"""
+    async with httpx.AsyncClient(timeout=HTTP_TIMEOUT, limits=HTTP_LIMITS) as client:
+        # Open a keepalive connection to each service up front so the first test
+        # does not pay the connect cost; failures are left for the tests to report
+        await asyncio.gather(
+            *(client.get(f"{url}/health") for url in (GATEWAY_URL, HELLO_WORLD_URL, LATEX_SERVER_URL)),
+            return_exceptions=True
+        )
+        yield client
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def gateway_helper(shared_http_client: httpx.AsyncClient):
+    """Helper for gateway tool calls with a single MCP session shared across tests"""
+    async with MCPToolHelper(GATEWAY_URL, client=shared_http_client) as helper:
         yield helper
 
-@pytest.fixture
-async def latex_helper():
-    """Helper for direct LaTeX server tool calls with proper MCP session"""
-    async with MCPToolHelper(LATEX_SERVER_URL) as helper:
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def latex_helper(shared_http_client: httpx.AsyncClient):
+    """Helper for direct LaTeX server tool calls with a single MCP session shared across tests"""
+    async with MCPToolHelper(LATEX_SERVER_URL, client=shared_http_client) as helper:
         yield helper
 
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def uploaded_sample(gateway_helper: "MCPToolHelper", sample_latex_document: str) -> Dict[str, Any]:
+    """Upload result for sample_latex_document, uploaded once and shared by tests that only need a file_id"""
+    # Deliberately not prefixed with TEST_FILE_PREFIX: the per-test file_cleanup fixture would
+    # delete it between tests. The session-end shared_files cleanup removes it instead.
+    result = await gateway_helper.call_tool(
+        "latex_upload_latex_file",
+        {"content": sample_latex_document, "filename": "shared_sample.tex"}
+    )
+    assert result.get("success") is True, f"Shared sample upload failed: {result}"
+    return result
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def latex_available(gateway_helper: "MCPToolHelper", uploaded_sample: Dict[str, Any]) -> bool:
+    """Whether the LaTeX server can compile, probed once per session with the shared sample"""
+    result = await gateway_helper.call_tool("latex_compile_latex_by_id", {"file_id": uploaded_sample["file_id"]})
+    # Other failures count as available so the tests themselves report them
+    return bool(result.get("success")) or not LATEX_UNAVAILABLE.search(result.get("error", ""))
+
+@pytest.fixture
+def requires_latex(latex_available: bool):
+    """Skip tests that need a successful compile when LaTeX is not installed"""
+    if not latex_available:
+        pytest.skip("LaTeX not available in test environment")
+
 async def debug_list_tools():
     """Utility to print all tools available via MCPToolHelper session."""
     async with MCPToolHelper(GATEWAY_URL) as helper:
+        await helper.ensure_initialized()
+        
         # List tools via MCP protocol
         request = {
             "jsonrpc": "2.0",
@@ -316,13 +526,9 @@ async def debug_list_tools():
             "params": {}
         }
         response = await helper.client.post(
-            f"{helper.base_url}/mcp/",
-            json=request,
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream",
-                "Mcp-Session-Id": helper.session_id
-            }
+            helper.mcp_url,
+            content=orjson.dumps(request),
+            headers=helper.session_headers
         )
         print("Status:", response.status_code)
         print("Response:", response.text)
@@ -5,324 +5,216 @@ Tests the complete upload -> compile -> error checking workflow
 
 import pytest
 from pathlib import Path
-from .conftest import MCPToolHelper, GATEWAY_URL
+from .conftest import LATEX_UNAVAILABLE
+
+pytestmark = [pytest.mark.asyncio(loop_scope="session"), pytest.mark.usefixtures("file_cleanup"), pytest.mark.serial]
 
 class TestLatexWorkflow:
     """Test complete LaTeX workflow using file-based tools"""
 
-    @pytest.mark.asyncio
-    async def test_complete_workflow_success(self, sample_latex_document: str, test_filename):
+    @pytest.mark.usefixtures("requires_latex")
+    async def test_complete_workflow_success(self, gateway_helper, uploaded_sample):
         """Test complete successful workflow: upload -> compile -> result"""
-        async with MCPToolHelper(GATEWAY_URL) as gateway_helper:
-            # Step 1: Upload file
-            upload_result = await gateway_helper.call_tool(
-                "latex_upload_latex_file",
-                {
-                    "content": sample_latex_document,
-                    "filename": test_filename("workflow", "tex")
-                }
-            )
-            assert upload_result.get("success") is True
-            assert "file_id" in upload_result
-            filename = upload_result["filename"]
-            # Accept UUID-based filenames from file server
-            assert filename.endswith(".tex") and len(filename) > 10  # UUID + .tex
-            file_id = upload_result["file_id"]
+        # Step 1: Upload file (shared across the session)
+        upload_result = uploaded_sample
+        assert "file_id" in upload_result
+        filename = upload_result["filename"]
+        # Accept UUID-based filenames from file server
+        assert filename.endswith(".tex") and len(filename) > 10  # UUID + .tex
+        file_id = upload_result["file_id"]
 
-            # Step 2: Compile file
-            compile_result = await gateway_helper.call_tool(
-                "latex_compile_latex_by_id",
-                {
-                    "file_id": file_id
-                }
-            )
-            # Check compilation result
-            if compile_result.get("success"):
-                # New format: download_url instead of pdf_path
-                assert "download_url" in compile_result or "file_id" in compile_result
-                assert "filename" in compile_result
-                assert "size_bytes" in compile_result
-                assert compile_result["size_bytes"] > 0
+        # Step 2: Compile file
+        compile_result = await gateway_helper.call_tool(
+            "latex_compile_latex_by_id",
+            {
+                "file_id": file_id
+            }
+        )
+        # Check compilation result
+        if compile_result.get("success"):
+            # New format: download_url instead of pdf_path
+            assert "download_url" in compile_result or "file_id" in compile_result
+            assert "filename" in compile_result
+            assert "size_bytes" in compile_result
+            assert compile_result["size_bytes"] > 0
+        else:
+            # If compilation fails, check what the actual error is
+            assert "error" in compile_result
+            error_message = compile_result["error"]
+            print(f"Compilation error: {error_message}")
+            
+            # Only skip if it's actually a LaTeX availability issue
+            if LATEX_UNAVAILABLE.search(error_message):
+                pytest.skip(f"LaTeX not available in test environment: {error_message}")
             else:
-                # If compilation fails, check what the actual error is
-                assert "error" in compile_result
-                error_message = compile_result["error"]
-                print(f"Compilation error: {error_message}")
-                
-                # Only skip if it's actually a LaTeX availability issue
-                if "pdflatex" in error_message.lower() or "latex" in error_message.lower():
-                    pytest.skip(f"LaTeX not available in test environment: {error_message}")
-                else:
-                    pytest.fail(f"Unexpected compilation error: {error_message}")
+                pytest.fail(f"Unexpected compilation error: {error_message}")
 
-    @pytest.mark.asyncio
-    async def test_workflow_with_errors(self, invalid_latex_document: str, test_filename):
+    async def test_workflow_with_errors(self, gateway_helper, invalid_latex_document: str, test_filename):
         """Test workflow with compilation errors"""
         
-        async with MCPToolHelper(GATEWAY_URL) as gateway_helper:
-            # Upload invalid document
-            upload_result = await gateway_helper.call_tool(
-                "latex_upload_latex_file",
-                {
-                    "content": invalid_latex_document,
-                    "filename": test_filename("invalid_test", "tex")
-                }
-            )
-            
-            assert upload_result.get("success") is True
-            file_id = upload_result["file_id"]
-            
-            # Try to compile (should fail)
-            compile_result = await gateway_helper.call_tool(
-                "latex_compile_latex_by_id",
-                {
-                    "file_id": file_id
-                }
-            )
-            
-            # LaTeX is quite forgiving - this may actually succeed
-            # Just verify we get a valid response structure
-            assert "success" in compile_result
-            if compile_result.get("success") is False:
-                assert "error" in compile_result
-            else:
-                # If it succeeded, should have PDF output (new format)
-                assert "download_url" in compile_result or "file_id" in compile_result or "filename" in compile_result
-            
-            # Get detailed errors
-            error_result = await gateway_helper.call_tool(
-                "latex_get_compilation_errors",
-                {"file_id": file_id}
-            )
-            
-            # Error checking may return different response format
-            assert "success" in error_result
-            if "errors" in error_result:
-                assert len(error_result["errors"]) > 0
-            elif "message" in error_result:
-                # Alternative response format for validation errors
-                assert len(error_result["message"]) > 0
-
-    @pytest.mark.asyncio
-    async def test_file_size_limits(self, large_latex_document: str, test_filename):
-        """Test file size validation"""
+        # Upload invalid document
+        upload_result = await gateway_helper.call_tool(
+            "latex_upload_latex_file",
+            {
+                "content": invalid_latex_document,
+                "filename": test_filename("invalid_test", "tex")
+            }
+        )
         
-        async with MCPToolHelper(GATEWAY_URL) as gateway_helper:
-            # Try to upload large document
-            upload_result = await gateway_helper.call_tool(
-                "latex_upload_latex_file",
-                {
-                    "content": large_latex_document,
-                    "filename": test_filename("large_test", "tex")
-                }
-            )
+        assert upload_result.get("success") is True
+        file_id = upload_result["file_id"]
         
-            # Should either succeed or fail with size error
-            if upload_result.get("success") is False:
-                assert "large" in upload_result["error"].lower() or "size" in upload_result["error"].lower()
-            else:
-                # If upload succeeds, compilation might fail due to size
-                file_id = upload_result["file_id"]
-                compile_result = await gateway_helper.call_tool(
-                    "latex_compile_latex_by_id",
-                    {"file_id": file_id}
-                )
-                # Either succeeds or fails - both are valid for large files
+        # Try to compile (should fail)
+        compile_result = await gateway_helper.call_tool(
+            "latex_compile_latex_by_id",
+            {
+                "file_id": file_id
+            }
+        )
+        
+        # LaTeX is quite forgiving - this may actually succeed
+        # Just verify we get a valid response structure
+        assert "success" in compile_result
+        if compile_result.get("success") is False:
+            # The failed compile already carries its diagnostics; no second round trip needed
+            errors = compile_result.get("errors") or compile_result.get("error")
+            assert errors
+            return
+        
+        # If it succeeded, should have PDF output (new format)
+        assert "download_url" in compile_result or "file_id" in compile_result or "filename" in compile_result
+        
+        # Get detailed errors (warnings) for the successful compile
+        error_result = await gateway_helper.call_tool(
+            "latex_get_compilation_errors",
+            {"file_id": file_id}
+        )
+        
+        # Error checking may return different response format
+        assert "success" in error_result
+        if "errors" in error_result:
+            assert len(error_result["errors"]) > 0
+        elif "message" in error_result:
+            # Alternative response format for validation errors
+            assert len(error_result["message"]) > 0
 
-    @pytest.mark.asyncio
-    async def test_nonexistent_file_compilation(self):
-        """Test compilation of non-existent file"""
+    async def test_file_size_limits(self, gateway_helper, large_latex_document: str, test_filename):
+        """Test file size validation"""
         
-        async with MCPToolHelper(GATEWAY_URL) as gateway_helper:
-            fake_file_id = "nonexistent-file-id"
-            
+        # Try to upload large document
+        upload_result = await gateway_helper.upload_latex(
+            large_latex_document,
+            test_filename("large_test", "tex")
+        )
+
+        # Should either succeed or fail with size error
+        if upload_result.get("success") is False:
+            assert "large" in upload_result["error"].lower() or "size" in upload_result["error"].lower()
+        else:
+            # If upload succeeds, compilation might fail due to size
+            file_id = upload_result["file_id"]
             compile_result = await gateway_helper.call_tool(
                 "latex_compile_latex_by_id",
-                {"file_id": fake_file_id}
+                {"file_id": file_id}
             )
-            
-            assert compile_result.get("success") is False
-            assert "not found" in compile_result["error"].lower()
+            # Either succeeds or fails - both are valid for large files
 
-    @pytest.mark.asyncio
-    async def test_error_checking_nonexistent_file(self):
-        """Test compilation error handling for non-existent file (get_compilation_errors tool was removed)"""
+    async def test_nonexistent_file_compilation(self, gateway_helper):
+        """Test compilation error handling for non-existent files (get_compilation_errors tool was removed)"""
         
-        async with MCPToolHelper(GATEWAY_URL) as gateway_helper:
-            fake_file_id = "nonexistent-file-id"
-            
-            # Since get_compilation_errors was removed, test compile_latex_by_id error handling
-            compile_result = await gateway_helper.call_tool(
-                "latex_compile_latex_by_id",
-                {"file_id": fake_file_id}
-            )
-            
+        # The probes are independent, so send them concurrently
+        results = await gateway_helper.call_tools_batch([
+            ("latex_compile_latex_by_id", {"file_id": "nonexistent-file-id"}),
+            ("latex_compile_latex_by_id", {"file_id": "another-nonexistent-file-id"})
+        ])
+        
+        for compile_result in results:
             assert compile_result.get("success") is False
             assert "error" in compile_result
-            error_msg = compile_result["error"].lower()
-            assert "not found" in error_msg or "file not found" in error_msg
+            assert "not found" in compile_result["error"].lower()
 
-    @pytest.mark.asyncio
-    async def test_token_efficiency(self, sample_latex_document: str, test_filename):
+    async def test_token_efficiency(self, gateway_helper, uploaded_sample):
         """Test that file-based approach uses fewer tokens than content-based"""
         
-        async with MCPToolHelper(GATEWAY_URL) as gateway_helper:
-            # Upload file once
-            upload_result = await gateway_helper.call_tool(
-                "latex_upload_latex_file",
-                {
-                    "content": sample_latex_document,
-                    "filename": test_filename("token_test", "tex")
-                }
-            )
-            
-            assert upload_result.get("success") is True
-            file_id = upload_result["file_id"]
-            
-            # Multiple compilations should use minimal tokens
-            for i in range(3):
-                compile_result = await gateway_helper.call_tool(
-                    "latex_compile_latex_by_id",
-                    {
-                        "file_id": file_id
-                    }
-                )
-                
-                # Each compilation call uses minimal tokens (just file_id)
-                # Success depends on LaTeX availability, but token usage is minimal regardless
-                assert "file_id" in {"file_id": file_id}  # Just ensure we're using file_id approach
-
-    @pytest.mark.asyncio
-    async def test_filename_preservation(self, sample_latex_document: str):
-        """Test that original filenames are preserved and output files have similar names"""
+        # File is uploaded once for the whole session
+        file_id = uploaded_sample["file_id"]
         
-        async with MCPToolHelper(GATEWAY_URL) as gateway_helper:
-            # Test with a specific filename
-            original_filename = "my_document.tex"
-            
-            # Upload file
-            upload_result = await gateway_helper.call_tool(
-                "latex_upload_latex_file",
-                {
-                    "content": sample_latex_document,
-                    "filename": original_filename
-                }
-            )
-            
-            assert upload_result.get("success") is True
-            assert "file_id" in upload_result
-            assert "original_filename" in upload_result
-            assert upload_result["original_filename"] == original_filename
-            assert "user_friendly_name" in upload_result
-            assert upload_result["user_friendly_name"] == original_filename
-            
-            file_id = upload_result["file_id"]
-            
-            # Compile file
-            compile_result = await gateway_helper.call_tool(
-                "latex_compile_latex_by_id",
-                {
-                    "file_id": file_id
-                }
-            )
-            
-            # Check compilation result
-            if compile_result.get("success"):
-                assert "download_url" in compile_result
-                assert "filename" in compile_result
-                assert "original_filename" in compile_result
-                assert "output_filename" in compile_result
-                
-                # Verify filename relationships
-                assert compile_result["original_filename"] == original_filename
-                assert compile_result["output_filename"] == "my_document.pdf"
-                
-                # The stored filename should be UUID-based but we get user-friendly info
-                stored_filename = compile_result["filename"]
-                assert stored_filename.endswith(".pdf") and len(stored_filename) > 10  # UUID + .pdf
-                
-            else:
-                # If compilation fails, check if it's a LaTeX availability issue
-                error_message = compile_result.get("error", "")
-                if "pdflatex" in error_message.lower() or "latex" in error_message.lower():
-                    pytest.skip(f"LaTeX not available in test environment: {error_message}")
-                else:
-                    pytest.fail(f"Unexpected compilation error: {error_message}")
+        # Multiple compilations should use minimal tokens; they don't depend on each other
+        results = await gateway_helper.call_tools_batch(
+            [("latex_compile_latex_by_id", {"file_id": file_id})] * 3
+        )
+        
+        # Each compilation call uses minimal tokens (just file_id)
+        # Success depends on LaTeX availability, but token usage is minimal regardless
+        assert len(results) == 3
+        for compile_result in results:
+            assert "success" in compile_result
 
-    @pytest.mark.asyncio
-    async def test_custom_output_filename(self, sample_latex_document: str):
-        """Test that custom output filenames work correctly"""
+    @pytest.mark.parametrize(
+        "original_filename,output_filename,expected_output",
+        [
+            ("my_document.tex", None, "my_document.pdf"),
+            ("source.tex", "custom_output.pdf", "custom_output.pdf"),
+        ],
+        ids=["default_output", "custom_output"]
+    )
+    async def test_filename_handling(self, gateway_helper, sample_latex_document: str, latex_available: bool,
+                                     original_filename: str, output_filename, expected_output: str):
+        """Test that original filenames are preserved and output files get the default or requested name"""
         
-        async with MCPToolHelper(GATEWAY_URL) as gateway_helper:
-            # Upload file
-            upload_result = await gateway_helper.call_tool(
-                "latex_upload_latex_file",
-                {
-                    "content": sample_latex_document,
-                    "filename": "source.tex"
-                }
-            )
-            
-            assert upload_result.get("success") is True
-            file_id = upload_result["file_id"]
-            
-            # Compile with custom output filename
-            compile_result = await gateway_helper.call_tool(
-                "latex_compile_latex_by_id",
-                {
-                    "file_id": file_id,
-                    "output_filename": "custom_output.pdf"
-                }
-            )
-            
-            # Check compilation result
-            if compile_result.get("success"):
-                assert "output_filename" in compile_result
-                assert compile_result["output_filename"] == "custom_output.pdf"
-                assert "original_filename" in compile_result
-                assert compile_result["original_filename"] == "source.tex"
-                
-            else:
-                # If compilation fails, check if it's a LaTeX availability issue
-                error_message = compile_result.get("error", "")
-                if "pdflatex" in error_message.lower() or "latex" in error_message.lower():
-                    pytest.skip(f"LaTeX not available in test environment: {error_message}")
-                else:
-                    pytest.fail(f"Unexpected compilation error: {error_message}")
+        # Upload file (checked even without LaTeX; only the compile step needs it)
+        upload = await gateway_helper.upload_file(sample_latex_document, original_filename)
+        
+        assert upload.success and upload.file_id
+        assert upload.original_filename == original_filename
+        assert upload.user_friendly_name == original_filename
+        
+        if not latex_available:
+            pytest.skip("LaTeX not available in test environment")
+        
+        # Compile file, with a custom output filename when requested
+        compiled = await gateway_helper.compile_file(upload.file_id, output_filename)
+        
+        # Check compilation result
+        assert compiled.success, f"Unexpected compilation error: {compiled.error}"
+        assert compiled.download_url
+        
+        # Verify filename relationships
+        assert compiled.original_filename == original_filename
+        assert compiled.output_filename == expected_output
+        
+        # The stored filename should be UUID-based but we get user-friendly info
+        assert compiled.filename.endswith(".pdf") and len(compiled.filename) > 10  # UUID + .pdf
 
 class TestLatexWorkflowThroughGateway:
     """Test LaTeX workflow through gateway proxy"""
 
-    @pytest.mark.asyncio
-    async def test_gateway_tool_discovery(self, test_filename):
+    async def test_gateway_tool_discovery(self, gateway_helper, test_filename):
         """Test that gateway discovers new file-based tools"""
         
-        async with MCPToolHelper(GATEWAY_URL) as gateway_helper:
-            # This test would require gateway to list tools
-            # For now, we test that tools are accessible through gateway
-            
-            # Try to call a file-based tool through gateway
-            upload_result = await gateway_helper.call_tool(
-                "latex_upload_latex_file",
-                {
-                    "content": "\\documentclass{article}\\begin{document}Test\\end{document}",
-                    "filename": test_filename("gateway_test", "tex", "workflow")
-                }
-            )
-            
-            # Should work through gateway proxy
-            assert "success" in upload_result
+        # This test would require gateway to list tools
+        # For now, we test that tools are accessible through gateway
+        
+        # Try to call a file-based tool through gateway
+        upload_result = await gateway_helper.call_tool(
+            "latex_upload_latex_file",
+            {
+                "content": "\\documentclass{article}\\begin{document}Test\\end{document}",
+                "filename": test_filename("gateway_test", "tex", "workflow")
+            }
+        )
+        
+        # Should work through gateway proxy
+        assert "success" in upload_result
 
-    @pytest.mark.asyncio
-    async def test_gateway_error_handling(self):
+    async def test_gateway_error_handling(self, gateway_helper):
         """Test gateway error handling for file-based tools"""
         
-        async with MCPToolHelper(GATEWAY_URL) as gateway_helper:
-            # Try invalid tool call
-            result = await gateway_helper.call_tool(
-                "latex_nonexistent_tool",
-                {"test": "data"}
-            )
-            
-            # Should get proper error from gateway
-            assert result.get("success") is False or "error" in result
\ No newline at end of file
+        # Try invalid tool call
+        result = await gateway_helper.call_tool(
+            "latex_nonexistent_tool",
+            {"test": "data"}
+        )
+        
+        # Should get proper error from gateway
+        assert result.get("success") is False or "error" in result
\ No newline at end of file
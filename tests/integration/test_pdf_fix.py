@@ -1,45 +1,27 @@
-#!/usr/bin/env python3
+"""
+Regression test for uploads named *.pdf being stored as *.pdf.pdf
+"""
 
-import asyncio
-import sys
-import os
+import pytest
 
-# Add the current directory to the path
-sys.path.insert(0, os.path.dirname(__file__))
+pytestmark = [pytest.mark.asyncio(loop_scope="session"), pytest.mark.serial]
 
-from integration.conftest import MCPToolHelper, GATEWAY_URL
-
-async def test_pdf_fix():
-    print("Testing .pdf.pdf fix...")
+async def test_pdf_fix_no_double_extension(gateway_helper):
+    """Uploading a source named with a .pdf extension must not produce a .pdf.pdf file"""
+    # Test uploading a file with .pdf extension
+    result = await gateway_helper.call_tool('latex_upload_latex_file', {
+        'content': '\\documentclass{article}\\begin{document}test\\end{document}',
+        'filename': 'reuse_test.pdf'
+    })
     
-    async with MCPToolHelper(GATEWAY_URL) as helper:
-        # Test uploading a file with .pdf extension
-        result = await helper.call_tool('latex_upload_latex_file', {
-            'content': '\\documentclass{article}\\begin{document}test\\end{document}',
-            'filename': 'reuse_test.pdf'
-        })
-        
-        print(f"Upload result: {result}")
-        
-        if result.get('success'):
-            file_id = result.get('file_id')
-            filename = result.get('filename')
-            print(f"File ID: {file_id}")
-            print(f"Filename: {filename}")
-            
-            # Check if filename has .pdf.pdf
-            if '.pdf.pdf' in filename:
-                print("❌ FAIL: Still has .pdf.pdf extension!")
-            else:
-                print("✅ PASS: No .pdf.pdf extension!")
-                
-            # Try to compile it
-            compile_result = await helper.call_tool('latex_compile_latex_by_id', {
-                'file_id': file_id
-            })
-            print(f"Compile result: {compile_result}")
-        else:
-            print(f"❌ Upload failed: {result}")
-
-if __name__ == "__main__":
-    asyncio.run(test_pdf_fix()) 
\ No newline at end of file
+    assert result.get('success') is True, f"Upload failed: {result}"
+    file_id = result['file_id']
+    
+    # Check the stored filename has no .pdf.pdf extension
+    assert '.pdf.pdf' not in result['filename']
+    
+    # Compiling it should give a well-formed response (success depends on LaTeX availability)
+    compile_result = await gateway_helper.call_tool('latex_compile_latex_by_id', {
+        'file_id': file_id
+    })
+    assert "success" in compile_result 
\ No newline at end of file
@@ -3,7 +3,9 @@
 # /// script
 # requires-python = ">=3.12,<3.13"
 # dependencies = [
+#     "pytest==8.4.*",
 #     "httpx==0.28.*",
+#     "orjson>=3.10",
 # ]
 # ///
 """
@@ -11,33 +13,51 @@ Debug script to test file upload and see what filename is actually saved
 """
 
 import asyncio
+import logging
+import os
 import httpx
+import pytest
 import json
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import orjson
+
+if __name__ == "__main__":
+    # pytest puts tests/ on sys.path via its pythonpath setting; a direct run needs it added here
+    import sys
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
 
 from unit.test_utils import get_test_filename
+from mcp_session_helper import find_sse_data_line
+
+log = logging.getLogger(__name__)
+
+pytestmark = pytest.mark.serial
+
+def _new_client() -> httpx.AsyncClient:
+    """HTTP client for the debug helpers; one can serve both the gateway and the LaTeX server"""
+    timeout = httpx.Timeout(20.0, connect=10.0)
+    limits = httpx.Limits(max_keepalive_connections=20, max_connections=30, keepalive_expiry=30.0)
+    return httpx.AsyncClient(timeout=timeout, limits=limits)
 
 class MCPToolHelper:
     """Helper class for MCP tool calls with proper session management"""
     
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, client: httpx.AsyncClient = None):
         self.base_url = base_url
         self.session_id = None
-        self.client = None
+        self.client = client
+        # Injected clients are shared and closed by their owner, not by this helper
+        self._owns_client = client is None
     
     async def __aenter__(self):
         """Async context manager entry"""
-        timeout = httpx.Timeout(20.0, connect=10.0)
-        limits = httpx.Limits(max_keepalive_connections=20, max_connections=30)
-        self.client = httpx.AsyncClient(timeout=timeout, limits=limits)
+        if self._owns_client:
+            self.client = _new_client()
         await self.initialize()
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self.client:
+        if self.client and self._owns_client:
             await self.client.aclose()
     
     async def initialize(self):
@@ -62,7 +82,7 @@ class MCPToolHelper:
         
         response = await self.client.post(
             f"{self.base_url}/mcp/",
-            json=init_request,
+            content=orjson.dumps(init_request),
             headers={
                 "Content-Type": "application/json",
                 "Accept": "application/json, text/event-stream"
@@ -86,7 +106,7 @@ class MCPToolHelper:
         
         notify_response = await self.client.post(
             f"{self.base_url}/mcp/",
-            json=initialized_request,
+            content=orjson.dumps(initialized_request),
             headers={
                 "Content-Type": "application/json",
                 "Accept": "application/json, text/event-stream",
@@ -117,7 +137,7 @@ class MCPToolHelper:
         
         response = await self.client.post(
             f"{self.base_url}/mcp/",
-            json=request,
+            content=orjson.dumps(request),
             headers={
                 "Content-Type": "application/json",
                 "Accept": "application/json, text/event-stream",
@@ -126,26 +146,21 @@ class MCPToolHelper:
         )
         
         if response.status_code == 200:
-            return self._parse_sse_response(response.text)
+            return self._parse_sse_response(response.content)
         else:
             return {"success": False, "error": f"HTTP {response.status_code}: {response.text}"}
     
-    def _parse_sse_response(self, response_text: str) -> dict:
+    def _parse_sse_response(self, response_bytes: bytes) -> dict:
         """Parse MCP response from SSE format"""
-        lines = response_text.strip().split('\n')
-        
-        # Find the data line
-        data_line = None
-        for line in lines:
-            if line.startswith('data: '):
-                data_line = line[6:]  # Remove 'data: ' prefix
-                break
+        # Work on the raw UTF-8 body: orjson decodes bytes directly, so the
+        # response never goes through httpx's charset detection and str decode
+        data_line = find_sse_data_line(response_bytes)
         
         if not data_line:
-            return {"success": False, "error": f"No data line found in SSE response: {response_text}"}
+            return {"success": False, "error": f"No data line found in SSE response: {response_bytes.decode('utf-8', 'replace')}"}
         
         try:
-            data = json.loads(data_line)
+            data = orjson.loads(data_line)
             if "result" in data:
                 result = data["result"]
                 if isinstance(result, dict) and "content" in result:
@@ -153,8 +168,8 @@ class MCPToolHelper:
                     if content and isinstance(content, list):
                         text = content[0].get("text", "{}")
                         try:
-                            return json.loads(text)
-                        except json.JSONDecodeError:
+                            return orjson.loads(text)
+                        except orjson.JSONDecodeError:
                             if result.get("isError"):
                                 return {"success": False, "error": text}
                             else:
@@ -164,8 +179,8 @@ class MCPToolHelper:
                 return {"success": False, "error": data["error"]}
             else:
                 return data
-        except json.JSONDecodeError as e:
-            return {"success": False, "error": f"Invalid JSON in SSE data: {data_line}"}
+        except orjson.JSONDecodeError as e:
+            return {"success": False, "error": f"Invalid JSON in SSE data: {data_line.decode('utf-8', 'replace')}"}
         
         return {"success": False, "error": "Failed to parse response"}
 
@@ -174,7 +189,7 @@ async def test_upload():
     
     # Generate a test filename
     test_filename = get_test_filename("debug_test", "tex", "upload")
-    print(f"Generated filename: {test_filename}")
+    log.debug("Generated filename: %s", test_filename)
     
     # Test content
     content = r"""
@@ -184,53 +199,48 @@ Debug test document
 \end{document}
 """
     
-    # Test 1: Upload through gateway
-    print("\n=== Testing through Gateway ===")
-    async with MCPToolHelper("http://localhost:8080") as helper:
-        result = await helper.call_tool(
-            "latex_upload_latex_file",
-            {
-                "content": content,
-                "filename": test_filename
-            }
-        )
-        
-        print(f"Gateway upload result: {json.dumps(result, indent=2)}")
-        
-        if result.get("success"):
-            print(f"Uploaded filename: {result.get('filename')}")
-            print(f"File ID: {result.get('file_id')}")
+    async def upload(client: httpx.AsyncClient, base_url: str, tool_name: str) -> dict:
+        async with MCPToolHelper(base_url, client=client) as helper:
+            return await helper.call_tool(
+                tool_name,
+                {
+                    "content": content,
+                    "filename": test_filename
+                }
+            )
     
-    # Test 2: Upload directly to LaTeX server
-    print("\n=== Testing directly to LaTeX Server ===")
-    async with MCPToolHelper("http://localhost:8002") as helper:
-        result = await helper.call_tool(
-            "upload_latex_file",
-            {
-                "content": content,
-                "filename": test_filename
-            }
+    # Both helpers share one connection pool, and the two uploads are independent
+    async with _new_client() as client:
+        gateway_result, direct_result = await asyncio.gather(
+            # Test 1: Upload through gateway
+            upload(client, "http://localhost:8080", "latex_upload_latex_file"),
+            # Test 2: Upload directly to LaTeX server
+            upload(client, "http://localhost:8002", "upload_latex_file")
         )
-        
-        print(f"Direct upload result: {json.dumps(result, indent=2)}")
+    
+    for label, result in (("Gateway", gateway_result), ("Direct", direct_result)):
+        log.debug("\n=== %s upload ===", label)
+        # The result can echo back the whole document, so only pretty-print it when it will be shown
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("%s upload result: %s", label, json.dumps(result, indent=2))
         
         if result.get("success"):
-            print(f"Uploaded filename: {result.get('filename')}")
-            print(f"File ID: {result.get('file_id')}")
+            log.debug("Uploaded filename: %s", result.get("filename"))
+            log.debug("File ID: %s", result.get("file_id"))
     
     # Check what's actually in the uploads directory
-    print("\n=== Files in uploads directory ===")
-    import os
-    from pathlib import Path
-    
-    uploads_dir = Path("../latex-server/uploads")
-    if uploads_dir.exists():
-        files = list(uploads_dir.glob("*.tex"))
-        print(f"Files in uploads directory:")
-        for file in files:
-            print(f"  - {file.name}")
+    log.debug("\n=== Files in uploads directory ===")
+    uploads_dir = "../latex-server/uploads"
+    if os.path.isdir(uploads_dir):
+        with os.scandir(uploads_dir) as entries:
+            files = [entry.name for entry in entries if entry.name.endswith(".tex")]
+        log.debug("Files in uploads directory:")
+        for name in files:
+            log.debug("  - %s", name)
     else:
-        print("Uploads directory does not exist")
+        log.debug("Uploads directory does not exist")
 
 if __name__ == "__main__":
+    logging.basicConfig(format="%(message)s")
+    log.setLevel(logging.DEBUG)
     asyncio.run(test_upload()) 
\ No newline at end of file
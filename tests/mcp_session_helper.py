@@ -4,22 +4,59 @@ MCP Session Helper Functions
 Provides utilities for managing MCP sessions and parsing responses in tests.
 """
 
-import json
+import itertools
 import httpx
+import orjson
 from typing import Dict, Any, Optional, List
 
+# Keep idle connections longer than httpx's 5s default so the initialize -> initialized ->
+# tools/call sequence does not reconnect when a slow tool call (e.g. a LaTeX compile) sits in between
+HTTP_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30.0)
+
+_BASE_HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json, text/event-stream"
+}
+
+# The handshake payloads never vary, so serialize them once at import
+_INIT_BODY = orjson.dumps({
+    "jsonrpc": "2.0",
+    "id": "init-1",
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2024-11-05",
+        "clientInfo": {
+            "name": "mcp-test-client",
+            "version": "0.3.0"
+        },
+        "capabilities": {}
+    }
+})
+_INITIALIZED_BODY = orjson.dumps({
+    "jsonrpc": "2.0",
+    "method": "notifications/initialized",
+    "params": {}
+})
+
 
 class MCPSession:
     """Helper class for managing MCP sessions in tests"""
     
     def __init__(self, base_url: str):
         self.base_url = base_url
+        # Parsed once; every request goes to the same endpoint
+        self._mcp_url = httpx.URL(f"{base_url}/mcp/")
         self.session_id: Optional[str] = None
         self.client: Optional[httpx.AsyncClient] = None
+        # Request headers for the session, built once its ID is known
+        self._headers: Dict[str, str] = {}
+        # Counter for default request IDs, so calls on a shared session never reuse one
+        self._next_id = itertools.count(1)
         
     async def __aenter__(self):
         """Async context manager entry"""
-        self.client = httpx.AsyncClient()
+        self.client = httpx.AsyncClient(timeout=HTTP_TIMEOUT, limits=HTTP_LIMITS)
         await self.initialize()
         return self
         
@@ -34,27 +71,10 @@ class MCPSession:
             raise RuntimeError("Client not initialized")
             
         # Step 1: Send initialize request
-        init_request = {
-            "jsonrpc": "2.0",
-            "id": "init-1",
-            "method": "initialize",
-            "params": {
-                "protocolVersion": "2024-11-05",
-                "clientInfo": {
-                    "name": "mcp-test-client",
-                    "version": "0.3.0"
-                },
-                "capabilities": {}
-            }
-        }
-        
         response = await self.client.post(
-            f"{self.base_url}/mcp/",
-            json=init_request,
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream"
-            }
+            self._mcp_url,
+            content=_INIT_BODY,
+            headers=_BASE_HEADERS
         )
         
         if response.status_code != 200:
@@ -64,25 +84,16 @@ class MCPSession:
         self.session_id = response.headers.get("mcp-session-id")
         if not self.session_id:
             raise RuntimeError("No session ID returned from initialize")
+        self._headers = {**_BASE_HEADERS, "Mcp-Session-Id": self.session_id}
         
         # Parse SSE response
         init_result = self._parse_sse_response(response.text)
         
         # Step 2: Send initialized notification
-        initialized_request = {
-            "jsonrpc": "2.0",
-            "method": "notifications/initialized",
-            "params": {}
-        }
-        
         notify_response = await self.client.post(
-            f"{self.base_url}/mcp/",
-            json=initialized_request,
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream",
-                "Mcp-Session-Id": self.session_id
-            }
+            self._mcp_url,
+            content=_INITIALIZED_BODY,
+            headers=self._headers
         )
         
         if notify_response.status_code not in [200, 202]:
@@ -99,7 +110,7 @@ class MCPSession:
             arguments = {}
         
         if request_id is None:
-            request_id = f"call-{tool_name}-{id(arguments)}"
+            request_id = f"call-{tool_name}-{next(self._next_id)}"
         
         tool_request = {
             "jsonrpc": "2.0",
@@ -112,13 +123,9 @@ class MCPSession:
         }
         
         response = await self.client.post(
-            f"{self.base_url}/mcp/",
-            json=tool_request,
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream",
-                "Mcp-Session-Id": self.session_id
-            }
+            self._mcp_url,
+            content=orjson.dumps(tool_request),
+            headers=self._headers
         )
         
         if response.status_code != 200:
@@ -139,13 +146,9 @@ class MCPSession:
         }
         
         response = await self.client.post(
-            f"{self.base_url}/mcp/",
-            json=tools_request,
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream",
-                "Mcp-Session-Id": self.session_id
-            }
+            self._mcp_url,
+            content=orjson.dumps(tools_request),
+            headers=self._headers
         )
         
         if response.status_code != 200:
@@ -162,7 +165,7 @@ class MCPSession:
             params = {}
         
         if request_id is None:
-            request_id = f"raw-{method}-{id(params)}"
+            request_id = f"raw-{method}-{next(self._next_id)}"
         
         request_data = {
             "jsonrpc": "2.0",
@@ -172,32 +175,23 @@ class MCPSession:
         }
         
         return await self.client.post(
-            f"{self.base_url}/mcp/",
-            json=request_data,
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream",
-                "Mcp-Session-Id": self.session_id
-            }
+            self._mcp_url,
+            content=orjson.dumps(request_data),
+            headers=self._headers
         )
     
     def _parse_sse_response(self, sse_text: str) -> Dict[str, Any]:
         """Parse Server-Sent Events response format"""
-        lines = sse_text.strip().split('\n')
-        
-        # Find the data line
-        data_line = None
-        for line in lines:
-            if line.startswith('data: '):
-                data_line = line[6:]  # Remove 'data: ' prefix
-                break
+        # Find the first data line in one scan instead of splitting the whole body into lines
+        _, found, rest = ("\n" + sse_text).partition("\ndata: ")
+        data_line = rest.split("\n", 1)[0] if found else None
         
         if not data_line:
             raise ValueError(f"No data line found in SSE response: {sse_text}")
         
         try:
-            return json.loads(data_line)
-        except json.JSONDecodeError as e:
+            return orjson.loads(data_line)
+        except orjson.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON in SSE data: {data_line}") from e
 
 
@@ -208,16 +202,24 @@ async def create_mcp_session(base_url: str) -> MCPSession:
     return session
 
 
+def find_sse_data_line(body: bytes) -> Optional[bytes]:
+    """Return the payload of the first ``data: `` line in a raw SSE body, or None"""
+    # Index into the body instead of slicing or prefixing it, so only the data line is copied
+    if body.startswith(b"data: "):
+        start = 6
+    else:
+        start = body.find(b"\ndata: ")
+        if start == -1:
+            return None
+        start += 7
+    end = body.find(b"\n", start)
+    return body[start:end] if end != -1 else body[start:]
+
+
 def extract_tool_names(tools_result: Dict[str, Any]) -> List[str]:
     """Extract tool names from tools/list result"""
-    if "result" not in tools_result:
-        return []
-    
-    result = tools_result["result"]
-    if "tools" not in result:
-        return []
-    
-    tools = result["tools"]
+    result = tools_result.get("result")
+    tools = result.get("tools") if isinstance(result, dict) else None
     if not isinstance(tools, list):
         return []
     
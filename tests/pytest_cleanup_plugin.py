@@ -12,15 +12,11 @@ Pytest plugin for test file cleanup
 This plugin adds cleanup commands to pytest for managing test files.
 """
 
-import pytest
 import sys
-import os
+import pytest
 from pathlib import Path
 
-# Add the tests directory to the path so we can import test_utils
-sys.path.insert(0, os.path.dirname(__file__))
-
-from test_utils import cleanup_test_files, list_test_files, TEST_FILE_PREFIX
+from unit.test_utils import cleanup_test_files, list_test_files, TEST_FILE_PREFIX
 
 def pytest_addoption(parser):
     """Add command line options for cleanup"""
@@ -42,8 +38,7 @@ def pytest_configure(config):
         test_files = list_test_files()
         if test_files:
             print(f"\nFound {len(test_files)} test files with prefix '{TEST_FILE_PREFIX}':")
-            for file_path in test_files:
-                print(f"  - {file_path}")
+            sys.stdout.write("".join(f"  - {file_path}\n" for file_path in test_files))
         else:
             print(f"\nNo test files found with prefix '{TEST_FILE_PREFIX}'.")
         pytest.exit("Listed test files")
@@ -4,7 +4,8 @@
 # requires-python = ">=3.12,<3.13"
 # dependencies = [
 #    "pytest==8.4.*",
-#    "pytest-asyncio==1.0.*",
+#    "pytest-asyncio>=1.4",
+#    "uvloop>=0.21; sys_platform != 'win32'",
 #    "httpx==0.28.*",
 #    "fastapi>=0.115",
 #    "urllib3>=2.0"
@@ -18,68 +19,95 @@ Tests the complete flow from client registration through token acquisition and v
 """
 
 import pytest
+import pytest_asyncio
 import httpx
 import urllib.parse
 import json
 import time
 import asyncio
-from typing import Dict, Any, Optional
+import base64
+import hashlib
+import secrets
+from typing import AsyncGenerator, Dict, Any, Optional, Tuple
 
 # Test configuration
 GATEWAY_URL = "http://localhost:8080"
 CALLBACK_URL = "http://localhost:8090/callback"  # Mock callback server
 
+# Any valid PKCE pair will do, so generate one per run (basic implementation)
+PKCE_CODE_VERIFIER = base64.urlsafe_b64encode(secrets.token_bytes(32)).decode('utf-8').rstrip('=')
+PKCE_CODE_CHALLENGE = base64.urlsafe_b64encode(
+    hashlib.sha256(PKCE_CODE_VERIFIER.encode('utf-8')).digest()
+).decode('utf-8').rstrip('=')
+
+pytestmark = [pytest.mark.asyncio(loop_scope="session"), pytest.mark.serial]
+
+
+async def discover_oauth_endpoints(http_client: httpx.AsyncClient) -> Dict[str, str]:
+    """Discover OAuth endpoints from well-known configuration"""
+    # Test OAuth 2.1 discovery endpoint
+    response = await http_client.get("/.well-known/oauth-authorization-server")
+    assert response.status_code == 200
+    
+    discovery_data = response.json()
+    
+    # Verify required OAuth 2.1 endpoints
+    required_endpoints = [
+        "authorization_endpoint",
+        "token_endpoint",
+        "introspection_endpoint"
+    ]
+    
+    for endpoint in required_endpoints:
+        assert endpoint in discovery_data, f"Missing {endpoint} in discovery"
+    
+    return discovery_data
+
+
+async def discover_protected_resource(http_client: httpx.AsyncClient) -> Dict[str, Any]:
+    """Discover protected resource configuration"""
+    response = await http_client.get("/.well-known/oauth-protected-resource")
+    assert response.status_code == 200
+    
+    resource_data = response.json()
+    
+    # Verify required fields
+    required_fields = [
+        "resource_server",
+        "authorization_servers",
+        "scopes_supported"
+    ]
+    
+    for field in required_fields:
+        assert field in resource_data, f"Missing {field} in protected resource discovery"
+    
+    return resource_data
+
 
 class OAuthTestClient:
-    """Test client for OAuth flow testing"""
+    """Test client for OAuth flow testing
+    
+    Use as an async context manager: every request goes through one pooled
+    HTTP client, which is closed on exit unless it was passed in.
+    """
     
-    def __init__(self, gateway_url: str = GATEWAY_URL):
+    def __init__(self, gateway_url: str = GATEWAY_URL, http_client: Optional[httpx.AsyncClient] = None):
         self.gateway_url = gateway_url
         self.client_id: Optional[str] = None
         self.client_secret: Optional[str] = None
         self.access_token: Optional[str] = None
         self.refresh_token: Optional[str] = None
+        # httpx does not follow redirects by default, so the authorization 302 stays visible
+        self.http_client = http_client or httpx.AsyncClient(base_url=gateway_url, timeout=10.0)
+        # Injected clients are shared and closed by their owner, not by this helper
+        self._owns_client = http_client is None
     
-    async def discover_oauth_endpoints(self) -> Dict[str, str]:
-        """Discover OAuth endpoints from well-known configuration"""
-        async with httpx.AsyncClient() as client:
-            # Test OAuth 2.1 discovery endpoint
-            response = await client.get(f"{self.gateway_url}/.well-known/oauth-authorization-server")
-            assert response.status_code == 200
-            
-            discovery_data = response.json()
-            
-            # Verify required OAuth 2.1 endpoints
-            required_endpoints = [
-                "authorization_endpoint",
-                "token_endpoint",
-                "introspection_endpoint"
-            ]
-            
-            for endpoint in required_endpoints:
-                assert endpoint in discovery_data, f"Missing {endpoint} in discovery"
-            
-            return discovery_data
+    async def __aenter__(self):
+        return self
     
-    async def discover_protected_resource(self) -> Dict[str, Any]:
-        """Discover protected resource configuration"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{self.gateway_url}/.well-known/oauth-protected-resource")
-            assert response.status_code == 200
-            
-            resource_data = response.json()
-            
-            # Verify required fields
-            required_fields = [
-                "resource_server",
-                "authorization_servers",
-                "scopes_supported"
-            ]
-            
-            for field in required_fields:
-                assert field in resource_data, f"Missing {field} in protected resource discovery"
-            
-            return resource_data
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._owns_client:
+            await self.http_client.aclose()
     
     async def register_client(self, client_name: str = "Test OAuth Client") -> Dict[str, Any]:
         """Register OAuth client dynamically"""
@@ -91,30 +119,28 @@ class OAuthTestClient:
             "scope": "read write"
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.gateway_url}/oauth/register",
-                json=registration_data,
-                headers={"Content-Type": "application/json"}
-            )
-            
-            assert response.status_code == 200
-            registration_result = response.json()
-            
-            # Verify registration response
-            assert "client_id" in registration_result
-            assert registration_result["client_name"] == client_name
-            assert registration_result["redirect_uris"] == [CALLBACK_URL]
-            
-            self.client_id = registration_result["client_id"]
-            self.client_secret = registration_result.get("client_secret")
-            
-            return registration_result
+        response = await self.http_client.post(
+            "/oauth/register",
+            json=registration_data,
+            headers={"Content-Type": "application/json"}
+        )
+        
+        assert response.status_code == 200
+        registration_result = response.json()
+        
+        # Verify registration response
+        assert "client_id" in registration_result
+        assert registration_result["client_name"] == client_name
+        assert registration_result["redirect_uris"] == [CALLBACK_URL]
+        
+        self.client_id = registration_result["client_id"]
+        self.client_secret = registration_result.get("client_secret")
+        
+        return registration_result
     
-    async def start_authorization_flow(self, scope: str = "read write", state: str = "test-state-123") -> str:
-        """Start OAuth authorization flow and return authorization URL"""
-        if not self.client_id:
-            await self.register_client()
+    async def start_authorization_flow(self, scope: str = "read write", state: str = "test-state-123") -> Tuple[str, Dict[str, str]]:
+        """Start OAuth authorization flow and return the authorization path and query parameters"""
+        assert self.client_id, "Client not registered; use the oauth_client fixture or call register_client()"
         
         auth_params = {
             "response_type": "code",
@@ -124,31 +150,30 @@ class OAuthTestClient:
             "state": state
         }
         
-        auth_url = f"{self.gateway_url}/oauth/authorize?" + urllib.parse.urlencode(auth_params)
-        return auth_url
+        # httpx encodes the query itself, so there is no URL string to build here
+        return "/oauth/authorize", auth_params
     
-    async def complete_authorization(self, auth_url: str) -> str:
+    async def complete_authorization(self, path: str, params: Dict[str, str]) -> str:
         """Complete authorization flow and extract authorization code"""
-        async with httpx.AsyncClient(follow_redirects=False) as client:
-            response = await client.get(auth_url)
-            
-            # Should be a redirect
-            assert response.status_code == 302
-            assert "Location" in response.headers
-            
-            # Parse redirect location
-            redirect_url = response.headers["Location"]
-            parsed_url = urllib.parse.urlparse(redirect_url)
-            query_params = urllib.parse.parse_qs(parsed_url.query)
-            
-            # Extract authorization code
-            assert "code" in query_params, "Authorization code not found in redirect"
-            assert "state" in query_params, "State parameter not found in redirect"
-            
-            auth_code = query_params["code"][0]
-            state = query_params["state"][0]
-            
-            return auth_code
+        response = await self.http_client.get(path, params=params)
+        
+        # Should be a redirect
+        assert response.status_code == 302
+        assert "Location" in response.headers
+        
+        # Parse redirect location
+        redirect_url = response.headers["Location"]
+        parsed_url = urllib.parse.urlparse(redirect_url)
+        query_params = urllib.parse.parse_qs(parsed_url.query)
+        
+        # Extract authorization code
+        assert "code" in query_params, "Authorization code not found in redirect"
+        assert "state" in query_params, "State parameter not found in redirect"
+        
+        auth_code = query_params["code"][0]
+        state = query_params["state"][0]
+        
+        return auth_code
     
     async def exchange_code_for_token(self, auth_code: str) -> Dict[str, Any]:
         """Exchange authorization code for access token"""
@@ -162,66 +187,93 @@ class OAuthTestClient:
         if self.client_secret:
             token_data["client_secret"] = self.client_secret
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.gateway_url}/oauth/token",
-                data=token_data,
-                headers={"Content-Type": "application/x-www-form-urlencoded"}
-            )
-            
-            assert response.status_code == 200
-            token_result = response.json()
-            
-            # Verify token response
-            assert "access_token" in token_result
-            assert "token_type" in token_result
-            assert token_result["token_type"] == "bearer"
-            assert "expires_in" in token_result
-            assert "scope" in token_result
-            
-            self.access_token = token_result["access_token"]
-            self.refresh_token = token_result.get("refresh_token")
-            
-            return token_result
+        response = await self.http_client.post(
+            "/oauth/token",
+            data=token_data,
+            headers={"Content-Type": "application/x-www-form-urlencoded"}
+        )
+        
+        assert response.status_code == 200
+        token_result = response.json()
+        
+        # Verify token response
+        assert "access_token" in token_result
+        assert "token_type" in token_result
+        assert token_result["token_type"] == "bearer"
+        assert "expires_in" in token_result
+        assert "scope" in token_result
+        
+        self.access_token = token_result["access_token"]
+        self.refresh_token = token_result.get("refresh_token")
+        
+        return token_result
     
     async def introspect_token(self, token: str = None) -> Dict[str, Any]:
         """Introspect access token"""
         token_to_check = token or self.access_token
         assert token_to_check, "No token available for introspection"
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.gateway_url}/oauth/tokeninfo",
-                data={"token": token_to_check},
-                headers={"Content-Type": "application/x-www-form-urlencoded"}
-            )
-            
-            assert response.status_code == 200
-            introspection_result = response.json()
-            
-            return introspection_result
+        response = await self.http_client.post(
+            "/oauth/tokeninfo",
+            data={"token": token_to_check},
+            headers={"Content-Type": "application/x-www-form-urlencoded"}
+        )
+        
+        assert response.status_code == 200
+        introspection_result = response.json()
+        
+        return introspection_result
     
     async def make_authenticated_request(self, endpoint: str) -> httpx.Response:
         """Make authenticated request using Bearer token"""
         assert self.access_token, "No access token available"
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.gateway_url}{endpoint}",
-                headers={"Authorization": f"Bearer {self.access_token}"}
-            )
-            
-            return response
+        return await self.http_client.get(
+            endpoint,
+            headers={"Authorization": f"Bearer {self.access_token}"}
+        )
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def registered_client() -> AsyncGenerator[OAuthTestClient, None]:
+    """OAuth client registered once per session; tests use it through ``oauth_client``"""
+    async with OAuthTestClient() as client:
+        await client.register_client()
+        yield client
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def oauth_client(registered_client: OAuthTestClient) -> AsyncGenerator[OAuthTestClient, None]:
+    """Per-test OAuth client reusing the session registration and connection pool
+    
+    Tokens are per test, so a test's code exchange never changes another test's state.
+    """
+    async with OAuthTestClient(http_client=registered_client.http_client) as client:
+        client.client_id = registered_client.client_id
+        client.client_secret = registered_client.client_secret
+        yield client
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def oauth_discovery() -> Dict[str, Dict[str, Any]]:
+    """Both well-known discovery documents, fetched once: they are static for the gateway's lifetime"""
+    async with httpx.AsyncClient(base_url=GATEWAY_URL, timeout=10.0) as client:
+        authorization_server, protected_resource = await asyncio.gather(
+            discover_oauth_endpoints(client),
+            discover_protected_resource(client)
+        )
+    return {
+        "authorization_server": authorization_server,
+        "protected_resource": protected_resource
+    }
 
 
 class TestOAuthDiscovery:
     """Test OAuth discovery endpoints"""
     
-    @pytest.mark.asyncio
-    async def test_oauth_authorization_server_discovery(self):
+    async def test_oauth_authorization_server_discovery(self, oauth_discovery):
         """Test OAuth 2.1 authorization server discovery"""
-        oauth_client = OAuthTestClient()
-        discovery_data = await oauth_client.discover_oauth_endpoints()
+        discovery_data = oauth_discovery["authorization_server"]
         
         # Verify OAuth 2.1 compliance
         assert discovery_data["issuer"] == GATEWAY_URL
@@ -236,11 +288,9 @@ class TestOAuthDiscovery:
         assert "code" in discovery_data["response_types_supported"]
         assert "S256" in discovery_data["code_challenge_methods_supported"]
     
-    @pytest.mark.asyncio
-    async def test_oauth_protected_resource_discovery(self):
+    async def test_oauth_protected_resource_discovery(self, oauth_discovery):
         """Test OAuth 2.1 protected resource discovery"""
-        oauth_client = OAuthTestClient()
-        resource_data = await oauth_client.discover_protected_resource()
+        resource_data = oauth_discovery["protected_resource"]
         
         assert resource_data["resource_server"] == GATEWAY_URL
         assert GATEWAY_URL in resource_data["authorization_servers"]
@@ -252,10 +302,8 @@ class TestOAuthDiscovery:
 class TestOAuthClientRegistration:
     """Test OAuth client registration"""
     
-    @pytest.mark.asyncio
-    async def test_dynamic_client_registration_success(self):
+    async def test_dynamic_client_registration_success(self, oauth_client):
         """Test successful dynamic client registration"""
-        oauth_client = OAuthTestClient()
         registration_result = await oauth_client.register_client("Test Client App")
         
         assert oauth_client.client_id is not None
@@ -264,7 +312,6 @@ class TestOAuthClientRegistration:
         assert registration_result["response_types"] == ["code"]
         assert registration_result["token_endpoint_auth_method"] == "none"
     
-    @pytest.mark.asyncio
     async def test_dynamic_client_registration_with_custom_data(self):
         """Test client registration with custom data"""
         custom_data = {
@@ -288,7 +335,6 @@ class TestOAuthClientRegistration:
             assert registration_result["client_name"] == "Custom OAuth Client"
             assert registration_result["redirect_uris"] == custom_data["redirect_uris"]
     
-    @pytest.mark.asyncio
     async def test_client_registration_invalid_request(self):
         """Test client registration with invalid request data"""
         async with httpx.AsyncClient() as client:
@@ -307,30 +353,24 @@ class TestOAuthClientRegistration:
 class TestOAuthAuthorizationFlow:
     """Test OAuth authorization flow"""
     
-    @pytest.mark.asyncio
-    async def test_authorization_request_success(self):
+    async def test_authorization_request_success(self, oauth_client):
         """Test successful authorization request"""
-        oauth_client = OAuthTestClient()
-        auth_url = await oauth_client.start_authorization_flow()
+        auth_path, auth_params = await oauth_client.start_authorization_flow()
         
         # Test authorization endpoint
-        async with httpx.AsyncClient(follow_redirects=False) as client:
-            response = await client.get(auth_url)
-            
-            assert response.status_code == 302
-            redirect_location = response.headers["Location"]
-            
-            # Verify redirect contains authorization code and state
-            assert "code=" in redirect_location
-            assert "state=test-state-123" in redirect_location
-            assert CALLBACK_URL in redirect_location
+        client = oauth_client.http_client
+        response = await client.get(auth_path, params=auth_params)
+        
+        assert response.status_code == 302
+        redirect_location = response.headers["Location"]
+        
+        # Verify redirect contains authorization code and state
+        assert "code=" in redirect_location
+        assert "state=test-state-123" in redirect_location
+        assert CALLBACK_URL in redirect_location
     
-    @pytest.mark.asyncio
-    async def test_authorization_request_missing_redirect_uri(self):
+    async def test_authorization_request_missing_redirect_uri(self, oauth_client):
         """Test authorization request without redirect URI"""
-        oauth_client = OAuthTestClient()
-        await oauth_client.register_client()
-        
         auth_params = {
             "response_type": "code",
             "client_id": oauth_client.client_id,
@@ -339,61 +379,40 @@ class TestOAuthAuthorizationFlow:
             # Missing redirect_uri
         }
         
-        auth_url = f"{GATEWAY_URL}/oauth/authorize?" + urllib.parse.urlencode(auth_params)
+        client = oauth_client.http_client
+        response = await client.get("/oauth/authorize", params=auth_params)
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(auth_url)
-            
-            assert response.status_code == 400
-            error_data = response.json()
-            assert error_data["error"] == "invalid_request"
+        assert response.status_code == 400
+        error_data = response.json()
+        assert error_data["error"] == "invalid_request"
     
-    @pytest.mark.asyncio
-    async def test_authorization_with_pkce(self):
+    async def test_authorization_with_pkce(self, oauth_client):
         """Test authorization flow with PKCE (for future enhancement)"""
-        oauth_client = OAuthTestClient()
-        await oauth_client.register_client()
-        
-        # Generate PKCE parameters (basic implementation)
-        import hashlib
-        import base64
-        import secrets
-        
-        code_verifier = base64.urlsafe_b64encode(secrets.token_bytes(32)).decode('utf-8').rstrip('=')
-        code_challenge = base64.urlsafe_b64encode(
-            hashlib.sha256(code_verifier.encode('utf-8')).digest()
-        ).decode('utf-8').rstrip('=')
-        
         auth_params = {
             "response_type": "code",
             "client_id": oauth_client.client_id,
             "redirect_uri": CALLBACK_URL,
             "scope": "read write",
             "state": "test-state-pkce",
-            "code_challenge": code_challenge,
+            "code_challenge": PKCE_CODE_CHALLENGE,
             "code_challenge_method": "S256"
         }
         
-        auth_url = f"{GATEWAY_URL}/oauth/authorize?" + urllib.parse.urlencode(auth_params)
+        client = oauth_client.http_client
+        response = await client.get("/oauth/authorize", params=auth_params)
         
-        async with httpx.AsyncClient(follow_redirects=False) as client:
-            response = await client.get(auth_url)
-            
-            # Should still work (PKCE might not be implemented yet, but shouldn't break)
-            assert response.status_code == 302
+        # Should still work (PKCE might not be implemented yet, but shouldn't break)
+        assert response.status_code == 302
 
 
 class TestOAuthTokenExchange:
     """Test OAuth token exchange"""
     
-    @pytest.mark.asyncio
-    async def test_authorization_code_grant_success(self):
+    async def test_authorization_code_grant_success(self, oauth_client):
         """Test successful authorization code grant"""
-        oauth_client = OAuthTestClient()
-        
         # Complete full flow
-        auth_url = await oauth_client.start_authorization_flow()
-        auth_code = await oauth_client.complete_authorization(auth_url)
+        auth_path, auth_params = await oauth_client.start_authorization_flow()
+        auth_code = await oauth_client.complete_authorization(auth_path, auth_params)
         token_result = await oauth_client.exchange_code_for_token(auth_code)
         
         # Verify token response structure
@@ -408,34 +427,26 @@ class TestOAuthTokenExchange:
         assert introspection_result["token_type"] == "bearer"
         assert introspection_result["scope"] == "read write"
     
-    @pytest.mark.asyncio
-    async def test_token_exchange_invalid_grant_type(self):
+    async def test_token_exchange_invalid_grant_type(self, oauth_client):
         """Test token exchange with invalid grant type"""
-        oauth_client = OAuthTestClient()
-        await oauth_client.register_client()
-        
         token_data = {
             "grant_type": "client_credentials",  # Unsupported
             "client_id": oauth_client.client_id
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{GATEWAY_URL}/oauth/token",
-                data=token_data,
-                headers={"Content-Type": "application/x-www-form-urlencoded"}
-            )
-            
-            assert response.status_code == 400
-            error_data = response.json()
-            assert error_data["error"] == "unsupported_grant_type"
+        client = oauth_client.http_client
+        response = await client.post(
+            "/oauth/token",
+            data=token_data,
+            headers={"Content-Type": "application/x-www-form-urlencoded"}
+        )
+        
+        assert response.status_code == 400
+        error_data = response.json()
+        assert error_data["error"] == "unsupported_grant_type"
     
-    @pytest.mark.asyncio
-    async def test_token_exchange_invalid_code(self):
+    async def test_token_exchange_invalid_code(self, oauth_client):
         """Test token exchange with invalid authorization code"""
-        oauth_client = OAuthTestClient()
-        await oauth_client.register_client()
-        
         token_data = {
             "grant_type": "authorization_code",
             "code": "invalid-authorization-code",
@@ -443,24 +454,21 @@ class TestOAuthTokenExchange:
             "client_id": oauth_client.client_id
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{GATEWAY_URL}/oauth/token",
-                data=token_data,
-                headers={"Content-Type": "application/x-www-form-urlencoded"}
-            )
-            
-            # Should still return a token (simplified implementation)
-            # In production, this would validate the code
-            assert response.status_code == 200 or response.status_code == 400
+        client = oauth_client.http_client
+        response = await client.post(
+            "/oauth/token",
+            data=token_data,
+            headers={"Content-Type": "application/x-www-form-urlencoded"}
+        )
+        
+        # Should still return a token (simplified implementation)
+        # In production, this would validate the code
+        assert response.status_code == 200 or response.status_code == 400
     
-    @pytest.mark.asyncio
-    async def test_token_exchange_json_format(self):
+    async def test_token_exchange_json_format(self, oauth_client):
         """Test token exchange with JSON format request"""
-        oauth_client = OAuthTestClient()
-        
-        auth_url = await oauth_client.start_authorization_flow()
-        auth_code = await oauth_client.complete_authorization(auth_url)
+        auth_path, auth_params = await oauth_client.start_authorization_flow()
+        auth_code = await oauth_client.complete_authorization(auth_path, auth_params)
         
         token_data = {
             "grant_type": "authorization_code",
@@ -469,36 +477,33 @@ class TestOAuthTokenExchange:
             "client_id": oauth_client.client_id
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{GATEWAY_URL}/oauth/token",
-                json=token_data,
-                headers={"Content-Type": "application/json"}
-            )
-            
-            # Should handle JSON format (or return appropriate error)
-            if response.status_code == 200:
-                token_result = response.json()
-                assert "access_token" in token_result
-            elif response.status_code == 400:
-                # JSON format might not be supported, which is acceptable
-                error_data = response.json()
-                assert "error" in error_data
-            else:
-                pytest.fail(f"Unexpected status code: {response.status_code}")
+        client = oauth_client.http_client
+        response = await client.post(
+            "/oauth/token",
+            json=token_data,
+            headers={"Content-Type": "application/json"}
+        )
+        
+        # Should handle JSON format (or return appropriate error)
+        if response.status_code == 200:
+            token_result = response.json()
+            assert "access_token" in token_result
+        elif response.status_code == 400:
+            # JSON format might not be supported, which is acceptable
+            error_data = response.json()
+            assert "error" in error_data
+        else:
+            pytest.fail(f"Unexpected status code: {response.status_code}")
 
 
 class TestOAuthTokenIntrospection:
     """Test OAuth token introspection"""
     
-    @pytest.mark.asyncio
-    async def test_token_introspection_valid_token(self):
+    async def test_token_introspection_valid_token(self, oauth_client):
         """Test introspection of valid token"""
-        oauth_client = OAuthTestClient()
-        
         # Get valid token
-        auth_url = await oauth_client.start_authorization_flow()
-        auth_code = await oauth_client.complete_authorization(auth_url)
+        auth_path, auth_params = await oauth_client.start_authorization_flow()
+        auth_code = await oauth_client.complete_authorization(auth_path, auth_params)
         await oauth_client.exchange_code_for_token(auth_code)
         
         # Introspect token
@@ -515,7 +520,6 @@ class TestOAuthTokenIntrospection:
         assert exp_time > current_time  # Token should not be expired
         assert exp_time <= current_time + 7200  # Should expire within 2 hours
     
-    @pytest.mark.asyncio
     async def test_token_introspection_invalid_token(self):
         """Test introspection of invalid token"""
         async with httpx.AsyncClient() as client:
@@ -529,74 +533,66 @@ class TestOAuthTokenIntrospection:
             introspection_result = response.json()
             assert introspection_result["active"] is False
     
-    @pytest.mark.asyncio
-    async def test_token_introspection_bearer_header(self):
+    async def test_token_introspection_bearer_header(self, oauth_client):
         """Test token introspection using Authorization header"""
-        oauth_client = OAuthTestClient()
-        
         # Get valid token
-        auth_url = await oauth_client.start_authorization_flow()
-        auth_code = await oauth_client.complete_authorization(auth_url)
+        auth_path, auth_params = await oauth_client.start_authorization_flow()
+        auth_code = await oauth_client.complete_authorization(auth_path, auth_params)
         await oauth_client.exchange_code_for_token(auth_code)
         
         # Introspect using Bearer header
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{GATEWAY_URL}/oauth/tokeninfo",
-                headers={"Authorization": f"Bearer {oauth_client.access_token}"}
-            )
-            
-            assert response.status_code == 200
-            introspection_result = response.json()
-            assert introspection_result["active"] is True
+        client = oauth_client.http_client
+        response = await client.get(
+            "/oauth/tokeninfo",
+            headers={"Authorization": f"Bearer {oauth_client.access_token}"}
+        )
+        
+        assert response.status_code == 200
+        introspection_result = response.json()
+        assert introspection_result["active"] is True
 
 
 class TestOAuthSecurityFeatures:
     """Test OAuth security features"""
     
-    @pytest.mark.asyncio
-    async def test_state_parameter_validation(self):
+    async def test_state_parameter_validation(self, oauth_client):
         """Test state parameter is preserved in authorization flow"""
-        oauth_client = OAuthTestClient()
-        
         # Use specific state value
         test_state = "custom-state-12345"
-        auth_url = await oauth_client.start_authorization_flow(state=test_state)
+        auth_path, auth_params = await oauth_client.start_authorization_flow(state=test_state)
         
-        async with httpx.AsyncClient(follow_redirects=False) as client:
-            response = await client.get(auth_url)
-            
-            assert response.status_code == 302
-            redirect_location = response.headers["Location"]
-            
-            # Verify state is preserved
-            assert f"state={test_state}" in redirect_location
+        client = oauth_client.http_client
+        response = await client.get(auth_path, params=auth_params)
+        
+        assert response.status_code == 302
+        redirect_location = response.headers["Location"]
+        
+        # Verify state is preserved
+        assert f"state={test_state}" in redirect_location
     
-    @pytest.mark.asyncio
-    async def test_scope_parameter_handling(self):
+    async def test_scope_parameter_handling(self, oauth_client):
         """Test scope parameter handling"""
-        oauth_client = OAuthTestClient()
-        
         # Test different scopes
         test_scopes = ["read", "write", "read write", "admin"]
         
-        for scope in test_scopes:
-            auth_url = await oauth_client.start_authorization_flow(scope=scope)
-            auth_code = await oauth_client.complete_authorization(auth_url)
-            token_result = await oauth_client.exchange_code_for_token(auth_code)
-            
+        async def flow_for_scope(scope: str) -> Dict[str, Any]:
+            auth_path, auth_params = await oauth_client.start_authorization_flow(scope=scope)
+            auth_code = await oauth_client.complete_authorization(auth_path, auth_params)
+            return await oauth_client.exchange_code_for_token(auth_code)
+        
+        # The flows are independent: one client may hold several outstanding codes
+        token_results = await asyncio.gather(*(flow_for_scope(scope) for scope in test_scopes))
+        
+        for token_result in token_results:
             # Verify scope in token response
             assert "scope" in token_result
             # Note: Server might normalize scopes, so we check it's not empty
             assert token_result["scope"]
     
-    @pytest.mark.asyncio
-    async def test_token_expiration_handling(self):
+    async def test_token_expiration_handling(self, oauth_client):
         """Test token expiration is properly set"""
-        oauth_client = OAuthTestClient()
-        
-        auth_url = await oauth_client.start_authorization_flow()
-        auth_code = await oauth_client.complete_authorization(auth_url)
+        auth_path, auth_params = await oauth_client.start_authorization_flow()
+        auth_code = await oauth_client.complete_authorization(auth_path, auth_params)
         token_result = await oauth_client.exchange_code_for_token(auth_code)
         
         # Verify expiration time
@@ -616,7 +612,6 @@ class TestOAuthSecurityFeatures:
 class TestOAuthErrorHandling:
     """Test OAuth error handling"""
     
-    @pytest.mark.asyncio
     async def test_malformed_requests(self):
         """Test handling of malformed OAuth requests"""
         # Test invalid content type for token endpoint
@@ -629,7 +624,6 @@ class TestOAuthErrorHandling:
             
             assert response.status_code == 400
     
-    @pytest.mark.asyncio
     async def test_missing_required_parameters(self):
         """Test handling of missing required parameters"""
         # Test authorization without required parameters
@@ -648,56 +642,39 @@ class TestOAuthErrorHandling:
             
             assert response.status_code == 400
     
-    @pytest.mark.asyncio
-    async def test_concurrent_authorization_requests(self):
+    async def test_concurrent_authorization_requests(self, oauth_client):
         """Test handling of concurrent authorization requests"""
-        oauth_client = OAuthTestClient()
-        await oauth_client.register_client()
-        
         # Create multiple authorization URLs
-        auth_urls = []
+        auth_requests = []
         for i in range(5):
-            auth_url = await oauth_client.start_authorization_flow(state=f"concurrent-test-{i}")
-            auth_urls.append(auth_url)
+            auth_request = await oauth_client.start_authorization_flow(state=f"concurrent-test-{i}")
+            auth_requests.append(auth_request)
         
         # Process them concurrently with timeout
-        async with httpx.AsyncClient(follow_redirects=False, timeout=10.0) as client:
-            responses = await asyncio.gather(*[
-                client.get(url) for url in auth_urls
-            ], return_exceptions=True)
-            
-            # All should succeed (filter out exceptions)
-            successful_responses = [r for r in responses if not isinstance(r, Exception)]
-            assert len(successful_responses) >= 3, f"Expected at least 3 successful responses, got {len(successful_responses)}"
-            
-            for response in successful_responses:
-                assert response.status_code == 302
-                assert "code=" in response.headers["Location"]
+        client = oauth_client.http_client
+        responses = await asyncio.gather(*[
+            client.get(path, params=params) for path, params in auth_requests
+        ], return_exceptions=True)
+        
+        # All should succeed (filter out exceptions)
+        successful_responses = [r for r in responses if not isinstance(r, Exception)]
+        assert len(successful_responses) >= 3, f"Expected at least 3 successful responses, got {len(successful_responses)}"
+        
+        for response in successful_responses:
+            assert response.status_code == 302
+            assert "code=" in response.headers["Location"]
 
 
 class TestOAuthIntegration:
     """Test OAuth integration with MCP Adapter"""
     
-    @pytest.mark.asyncio
-    async def test_authenticated_mcp_access(self):
+    async def test_authenticated_mcp_access(self, oauth_client):
         """Test accessing MCP endpoints with OAuth token"""
-        oauth_client = OAuthTestClient()
-        
         # Complete OAuth flow
-        auth_url = await oauth_client.start_authorization_flow()
-        auth_code = await oauth_client.complete_authorization(auth_url)
+        auth_path, auth_params = await oauth_client.start_authorization_flow()
+        auth_code = await oauth_client.complete_authorization(auth_path, auth_params)
         await oauth_client.exchange_code_for_token(auth_code)
         
-        # Test authenticated access to HTTP endpoints (should still work)
-        response = await oauth_client.make_authenticated_request("/health")
-        assert response.status_code == 200
-        
-        response = await oauth_client.make_authenticated_request("/info")
-        assert response.status_code == 200
-        
-        response = await oauth_client.make_authenticated_request("/dashboard")
-        assert response.status_code == 200
-        
         # Test authenticated access to MCP endpoints (the main focus)
         mcp_request = {
             "jsonrpc": "2.0",
@@ -709,33 +686,28 @@ class TestOAuthIntegration:
                 "capabilities": {}
             }
         }
+        mcp_headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json, text/event-stream",
+            "Authorization": f"Bearer {oauth_client.access_token}"
+        }
         
-        # Test authenticated MCP access via root endpoint
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{GATEWAY_URL}/",
-                json=mcp_request,
-                headers={
-                    "Content-Type": "application/json",
-                    "Accept": "application/json, text/event-stream",
-                    "Authorization": f"Bearer {oauth_client.access_token}"
-                }
-            )
-            assert response.status_code == 200
-            
-            # Test authenticated MCP access via direct endpoint
-            response = await client.post(
-                f"{GATEWAY_URL}/mcp/",
-                json=mcp_request,
-                headers={
-                    "Content-Type": "application/json", 
-                    "Accept": "application/json, text/event-stream",
-                    "Authorization": f"Bearer {oauth_client.access_token}"
-                }
-            )
-            assert response.status_code == 200
+        # The requests only share the token, so send them together over the shared pool
+        client = oauth_client.http_client
+        responses = await asyncio.gather(
+            # HTTP endpoints (should still work)
+            oauth_client.make_authenticated_request("/health"),
+            oauth_client.make_authenticated_request("/info"),
+            oauth_client.make_authenticated_request("/dashboard"),
+            # MCP access via root endpoint
+            client.post("/", json=mcp_request, headers=mcp_headers),
+            # MCP access via direct endpoint
+            client.post("/mcp/", json=mcp_request, headers=mcp_headers)
+        )
+        
+        for response in responses:
+            assert response.status_code == 200, f"{response.request.url} returned {response.status_code}"
     
-    @pytest.mark.asyncio
     async def test_unauthenticated_access_properly_restricted(self):
         """Test that MCP endpoints require authentication while HTTP endpoints remain public"""
         async with httpx.AsyncClient() as client:
@@ -4,7 +4,8 @@
 # requires-python = ">=3.12,<3.13"
 # dependencies = [
 #    "pytest==8.4.*",
-#    "pytest-asyncio==1.0.*",
+#    "pytest-asyncio>=1.4",
+#    "uvloop>=0.21; sys_platform != 'win32'",
 #    "httpx==0.28.*",
 #    "fastapi>=0.115"
 # ]
@@ -34,6 +35,8 @@ GATEWAY_URL = "http://localhost:8080"
 FILE_SERVER_URL = "http://localhost:8003"
 LATEX_SERVER_URL = "http://localhost:8002"
 
+pytestmark = pytest.mark.serial
+
 
 class SecurityTestHelper:
     """Helper class for security testing"""
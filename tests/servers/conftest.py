@@ -0,0 +1,23 @@
+"""
+Server test fixtures
+"""
+
+import pytest_asyncio
+
+from mcp_session_helper import MCPSession
+
+# Test configuration
+GATEWAY_URL = "http://localhost:8080"
+HELLO_WORLD_URL = "http://localhost:8001"
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def hello_world_mcp_session():
+    """Initialized MCP session with the hello-world server, shared across tests"""
+    async with MCPSession(HELLO_WORLD_URL) as session:
+        yield session
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def gateway_mcp_session():
+    """Initialized MCP session with the gateway, shared across tests"""
+    async with MCPSession(GATEWAY_URL) as session:
+        yield session
@@ -5,7 +5,7 @@ Gateway connectivity tests
 import pytest
 import httpx
 
-from mcp_session_helper import MCPSession, extract_tool_result_content
+from mcp_session_helper import extract_tool_result_content
 import asyncio
 from typing import Dict, Any
 
@@ -13,11 +13,12 @@ from typing import Dict, Any
 GATEWAY_URL = "http://localhost:8080"
 HELLO_WORLD_URL = "http://localhost:8001"
 
+pytestmark = [pytest.mark.asyncio(loop_scope="session"), pytest.mark.serial]
+
 
 class TestGatewayConnectivity:
     """Test basic gateway connectivity"""
 
-    @pytest.mark.asyncio
     async def test_gateway_health(self):
         """Test gateway health endpoint"""
         async with httpx.AsyncClient() as client:
@@ -30,7 +31,6 @@ class TestGatewayConnectivity:
             assert "servers" in data
             assert "tools" in data
 
-    @pytest.mark.asyncio
     async def test_gateway_info(self):
         """Test gateway info endpoint"""
         async with httpx.AsyncClient() as client:
@@ -44,7 +44,6 @@ class TestGatewayConnectivity:
             assert "available_tools" in data
             assert isinstance(data["available_tools"], list)
 
-    @pytest.mark.asyncio
     async def test_gateway_dashboard(self):
         """Test gateway dashboard endpoint"""
         async with httpx.AsyncClient() as client:
@@ -52,7 +51,6 @@ class TestGatewayConnectivity:
             assert response.status_code == 200
             assert "text/html" in response.headers.get("content-type", "")
 
-    @pytest.mark.asyncio
     async def test_oauth_discovery(self):
         """Test OAuth discovery endpoint"""
         async with httpx.AsyncClient() as client:
@@ -64,7 +62,6 @@ class TestGatewayConnectivity:
             assert "authorization_endpoint" in data
             assert "token_endpoint" in data
 
-    @pytest.mark.asyncio
     async def test_mcp_root_endpoint_authentication_required(self):
         """Test that MCP requests to root endpoint require authentication"""
         async with httpx.AsyncClient() as client:
@@ -105,7 +102,6 @@ class TestGatewayConnectivity:
 class TestGatewayBackendConnectivity:
     """Test gateway's connectivity to backend servers"""
 
-    @pytest.mark.asyncio
     async def test_gateway_discovers_backend_servers(self):
         """Test gateway can discover and connect to backend servers"""
         async with httpx.AsyncClient() as client:
@@ -121,7 +117,6 @@ class TestGatewayBackendConnectivity:
             assert data["servers"] > 0
             assert data["tools"] > 0
 
-    @pytest.mark.asyncio
     async def test_gateway_aggregates_server_info(self):
         """Test gateway aggregates info from all backend servers"""
         async with httpx.AsyncClient() as client:
@@ -142,58 +137,52 @@ class TestGatewayBackendConnectivity:
 class TestGatewayHTTPToolProxy:
     """Test gateway tool proxying functionality via HTTP"""
 
-    @pytest.mark.asyncio
-    async def test_gateway_tool_discovery(self):
+    async def test_gateway_tool_discovery(self, gateway_mcp_session):
         """Test gateway discovers and lists tools from backend servers"""
-        async with MCPSession(GATEWAY_URL) as session:
-            tools_result = await session.list_tools()
-            
-            assert "result" in tools_result
-            assert "tools" in tools_result["result"]
-            tools = tools_result["result"]["tools"]
-            
-            # Should have prefixed tools from hello-world server
-            tool_names = [tool["name"] for tool in tools]
-            expected_hello_tools = ["hello_greet", "hello_add_numbers", "hello_get_timestamp"]
-            assert all(tool in tool_names for tool in expected_hello_tools)
-            
-            # Should have some tools from multiple servers
-            # Note: Exact latex tools may vary based on server availability
-            assert len(tool_names) >= 3  # At minimum hello server tools
-            print(f"Available tools: {tool_names}")  # Debug output
-
-    @pytest.mark.asyncio
-    async def test_gateway_tool_proxy_routing(self):
+        tools_result = await gateway_mcp_session.list_tools()
+        
+        assert "result" in tools_result
+        assert "tools" in tools_result["result"]
+        tools = tools_result["result"]["tools"]
+        
+        # Should have prefixed tools from hello-world server
+        tool_names = [tool["name"] for tool in tools]
+        expected_hello_tools = ["hello_greet", "hello_add_numbers", "hello_get_timestamp"]
+        assert all(tool in tool_names for tool in expected_hello_tools)
+        
+        # Should have some tools from multiple servers
+        # Note: Exact latex tools may vary based on server availability
+        assert len(tool_names) >= 3  # At minimum hello server tools
+        print(f"Available tools: {tool_names}")  # Debug output
+
+    async def test_gateway_tool_proxy_routing(self, gateway_mcp_session):
         """Test gateway properly routes tool calls to correct backend server"""
-        async with MCPSession(GATEWAY_URL) as session:
-            # Test routing to hello-world server
-            tool_result = await session.call_tool(
-                "hello_greet", 
-                {"name": "Gateway", "greeting": "Hi"}, 
-                "gateway-proxy-test"
-            )
-            
-            assert "result" in tool_result
-            content = extract_tool_result_content(tool_result)
-            assert "Hi, Gateway!" in content
-            assert tool_result["id"] == "gateway-proxy-test"
-
-    @pytest.mark.asyncio
-    async def test_gateway_handles_backend_errors(self):
+        # Test routing to hello-world server
+        tool_result = await gateway_mcp_session.call_tool(
+            "hello_greet", 
+            {"name": "Gateway", "greeting": "Hi"}, 
+            "gateway-proxy-test"
+        )
+        
+        assert "result" in tool_result
+        content = extract_tool_result_content(tool_result)
+        assert "Hi, Gateway!" in content
+        assert tool_result["id"] == "gateway-proxy-test"
+
+    async def test_gateway_handles_backend_errors(self, gateway_mcp_session):
         """Test gateway handles backend server errors gracefully"""
-        async with MCPSession(GATEWAY_URL) as session:
-            # Try to call a non-existent tool
-            response = await session.raw_request(
-                "tools/call",
-                {"name": "nonexistent_tool", "arguments": {}},
-                "error-test"
-            )
-            
-            assert response.status_code == 200
-            data = session._parse_sse_response(response.text)
-            
-            # Should get either an error response or a tool result with error
-            assert "error" in data or ("result" in data and data["result"].get("isError"))
-            assert data["id"] == "error-test"
+        # Try to call a non-existent tool
+        response = await gateway_mcp_session.raw_request(
+            "tools/call",
+            {"name": "nonexistent_tool", "arguments": {}},
+            "error-test"
+        )
+        
+        assert response.status_code == 200
+        data = gateway_mcp_session._parse_sse_response(response.text)
+        
+        # Should get either an error response or a tool result with error
+        assert "error" in data or ("result" in data and data["result"].get("isError"))
+        assert data["id"] == "error-test"
 
 
@@ -4,8 +4,10 @@
 # requires-python = ">=3.12,<3.13"
 # dependencies = [
 #    "pytest==8.4.*",
-#    "pytest-asyncio==1.0.*",
+#    "pytest-asyncio>=1.4",
+#    "uvloop>=0.21; sys_platform != 'win32'",
 #    "httpx==0.28.*",
+#    "pytest-xdist>=3.6",
 # ]
 # ///
 """
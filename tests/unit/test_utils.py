@@ -4,7 +4,8 @@
 # requires-python = ">=3.12,<3.13"
 # dependencies = [
 #     "pytest==8.4.*",
-#     "pytest-asyncio==1.0.*",
+#     "pytest-asyncio>=1.4",
+#     "uvloop>=0.21; sys_platform != 'win32'",
 # ]
 # ///
 """
@@ -16,6 +17,8 @@ import glob
 import shutil
 import uuid
 import time
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Optional, Dict
 import logging
@@ -25,6 +28,10 @@ logger = logging.getLogger(__name__)
 # Test file configuration
 TEST_FILE_PREFIX = "pytest"
 
+# Short identifier shared by every filename generated in this process (first 8 hex chars of a UUID).
+# Each xdist worker is its own process, so workers still get distinct filenames.
+SESSION_ID = uuid.uuid4().hex[:8]
+
 # Additional cleanup patterns for different file types
 CLEANUP_PATTERNS = {
     "latex_uploads": "*.tex",  # All .tex files in uploads
@@ -41,6 +48,10 @@ CLEANUP_PATTERNS = {
     "file_server_timeout_files": "timeout_test_*",  # Timeout test files
 }
 
+# Below this many files a thread pool costs more than the unlinks it overlaps
+PARALLEL_CLEANUP_THRESHOLD = 32
+CLEANUP_MAX_WORKERS = 16
+
 # Configuration for which cleanup patterns to use
 CLEANUP_CONFIG = {
     "use_test_prefix": True,  # Always use the test prefix
@@ -59,9 +70,14 @@ CLEANUP_CONFIG = {
     "reset_file_server_metadata": True,  # Reset metadata.json to empty
 }
 
+@lru_cache(maxsize=256)
 def get_test_filename(base_name: str, extension: str = "", descriptor: str = "") -> str:
     """
-    Generate a test filename with the standard prefix, descriptor, and unique identifier
+    Generate a test filename with the standard prefix, descriptor, and session identifier
+    
+    The identifier is generated once per test session, so filenames are unique per
+    (base_name, descriptor) pair; tests that upload several files should vary base_name.
+    Because the result depends only on the arguments, it is cached for the session.
     
     Args:
         base_name: Base name for the file
@@ -69,27 +85,14 @@ def get_test_filename(base_name: str, extension: str = "", descriptor: str = "")
         descriptor: Optional descriptor to identify the test type/purpose
     
     Returns:
-        Filename with test prefix, descriptor, and unique identifier
+        Filename with test prefix, descriptor, and session identifier
     """
     if extension and not extension.startswith('.'):
         extension = '.' + extension
     
-    # Generate a short unique identifier (first 8 chars of UUID)
-    unique_id = str(uuid.uuid4())[:8]
-    
-    # Build filename components
-    parts = [TEST_FILE_PREFIX]
-    
     if descriptor:
-        parts.append(descriptor)
-    
-    parts.append(base_name)
-    parts.append(unique_id)
-    
-    # Join with underscores and add extension
-    filename = "_".join(parts) + extension
-    
-    return filename
+        return f"{TEST_FILE_PREFIX}_{descriptor}_{base_name}_{SESSION_ID}{extension}"
+    return f"{TEST_FILE_PREFIX}_{base_name}_{SESSION_ID}{extension}"
 
 def cleanup_test_files(
     directories: Optional[List[str]] = None,
@@ -177,16 +180,24 @@ def cleanup_test_files(
                         logger.warning(f"Failed to reset metadata.json: {e}")
         
         # Remove all identified files
-        for file_path in files_to_remove:
-            try:
-                os.remove(file_path)
-                removed_count += 1
-                logger.debug(f"Removed file: {file_path}")
-            except OSError as e:
-                logger.warning(f"Failed to remove file {file_path}: {e}")
+        if len(files_to_remove) > PARALLEL_CLEANUP_THRESHOLD:
+            with ThreadPoolExecutor(max_workers=CLEANUP_MAX_WORKERS) as executor:
+                removed_count += sum(executor.map(_remove_file, files_to_remove))
+        else:
+            removed_count += sum(map(_remove_file, files_to_remove))
     
     return removed_count
 
+def _remove_file(file_path: str) -> bool:
+    """Remove a single file, logging failures; returns whether it was removed"""
+    try:
+        os.remove(file_path)
+        logger.debug(f"Removed file: {file_path}")
+        return True
+    except OSError as e:
+        logger.warning(f"Failed to remove file {file_path}: {e}")
+        return False
+
 def cleanup_test_files_by_pattern(pattern: str, directories: Optional[List[str]] = None) -> int:
     """
     Clean up test files matching a specific pattern
@@ -258,6 +269,10 @@ def list_test_files(directories: Optional[List[str]] = None) -> List[str]:
     
     return test_files
 
+def is_xdist_worker() -> bool:
+    """Return True when running inside a pytest-xdist worker process"""
+    return "PYTEST_XDIST_WORKER" in os.environ
+
 def ensure_test_directories():
     """Ensure test directories exist"""
     directories = [